@@ -90,6 +90,7 @@ class DataManager(SchemaEntity):
         path: str,
         relpath: str,
         data_type: DataType = DataType.PRIMARY,
+        checkpoint: bool = True,
     ) -> DataLocation:
         ...
 
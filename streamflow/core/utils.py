@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import base64
 import datetime
+import functools
 import importlib
 import itertools
 import os
@@ -147,10 +148,12 @@ def format_seconds_to_hhmmss(seconds: int) -> str:
     return "%02i:%02i:%02i" % (hours, minutes, seconds)
 
 
+@functools.lru_cache(maxsize=None)
 def get_class_fullname(cls: type):
     return cls.__module__ + "." + cls.__qualname__
 
 
+@functools.lru_cache(maxsize=None)
 def get_class_from_name(name: str) -> type:
     module_name, class_name = name.rsplit(".", 1)
     return getattr(importlib.import_module(module_name), class_name)
@@ -270,6 +273,16 @@ def get_tag(tokens: Iterable[Token]) -> str:
     return output_tag
 
 
+def install_event_loop_policy() -> None:
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        # Keep the default asyncio event loop (e.g., on Windows)
+        pass
+
+
 def random_name() -> str:
     return str(uuid.uuid4())
 
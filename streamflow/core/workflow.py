@@ -505,7 +505,7 @@ class Step(PersistableEntity, ABC):
 
 
 class Token(PersistableEntity):
-    __slots__ = ("persistent_id", "value", "tag")
+    __slots__ = ("value", "tag")
 
     def __init__(self, value: Any, tag: str = "0"):
         super().__init__()
@@ -10,6 +10,7 @@ import streamflow.ext
 from streamflow.config.config import WorkflowConfig
 from streamflow.config.validator import SfValidator
 from streamflow.core.exception import WorkflowDefinitionException
+from streamflow.core.utils import install_event_loop_policy
 from streamflow.ext.utils import load_extensions
 from streamflow.log_handler import logger
 from streamflow.main import build_context
@@ -108,6 +109,7 @@ def main(args) -> int:
             logger.setLevel(logging.WARN)
         elif args.debug:
             logger.setLevel(logging.DEBUG)
+        install_event_loop_policy()
         asyncio.run(_async_main(args))
         return 0
     except SystemExit as se:
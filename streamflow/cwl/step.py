@@ -337,7 +337,7 @@ class CWLLoopOutputAllStep(LoopOutputStep):
         return ListToken(
             tag=tag,
             value=sorted(
-                self.token_map.get(tag, []), key=lambda t: int(t.tag.split(".")[-1])
+                self.token_map.get(tag, []), key=lambda t: int(t.tag.rpartition(".")[2])
             ),
         )
 
@@ -348,7 +348,7 @@ class CWLLoopOutputLastStep(LoopOutputStep):
             tag=tag,
             value=sorted(
                 self.token_map.get(tag, [Token(value=None)]),
-                key=lambda t: int(t.tag.split(".")[-1]),
+                key=lambda t: int(t.tag.rpartition(".")[2]),
             )[-1],
         )
 
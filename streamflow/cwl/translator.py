@@ -1994,6 +1994,7 @@ class CWLTranslator:
                 )
         # Retrieve scatter method (default to dotproduct)
         scatter_method = cwl_element.tool.get("scatterMethod", "dotproduct")
+        scatter_size_port = None
         # If there are scatter inputs
         if scatter_inputs:
             # If any scatter input is null, propagate an empty array on the output ports
@@ -2049,6 +2050,16 @@ class CWLTranslator:
                 scatter_step.add_input_port(port_name, input_ports[global_name])
                 input_ports[global_name] = workflow.create_port()
                 scatter_step.add_output_port(port_name, input_ports[global_name])
+                # If outputs are gathered on a single level, let gather steps know the expected sizes
+                if scatter_size_port is None and (
+                    scatter_method == "dotproduct"
+                    or (
+                        len(scatter_inputs) == 1
+                        and scatter_method == "flat_crossproduct"
+                    )
+                ):
+                    scatter_size_port = workflow.create_port()
+                    scatter_step.add_size_port(scatter_size_port)
             # If there is a scatter combinator, create a combinator step and add all inputs to it
             if scatter_combinator:
                 combinator_step = workflow.create_step(
@@ -2134,6 +2145,7 @@ class CWLTranslator:
                         depth=1
                         if scatter_method == "dotproduct"
                         else len(scatter_inputs),
+                        size_port=scatter_size_port,
                     )
                     internal_output_ports[global_name] = workflow.create_port()
                     gather_step.add_input_port(
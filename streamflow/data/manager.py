@@ -57,6 +57,12 @@ class DefaultDataManager(DataManager):
         super().__init__(context)
         self.path_mapper = RemotePathMapper(context)
 
+    def _is_available(self, path: str, location: Location) -> bool:
+        return any(
+            loc.name == location.name and loc.available.is_set()
+            for loc in self.path_mapper.get(path, DataType.PRIMARY, location.deployment)
+        )
+
     async def close(self):
         pass
 
@@ -129,6 +135,7 @@ class DefaultDataManager(DataManager):
         path: str,
         relpath: str | None = None,
         data_type: DataType = DataType.PRIMARY,
+        checkpoint: bool = True,
     ) -> DataLocation:
         data_location = DataLocation(
             path=path,
@@ -140,7 +147,8 @@ class DefaultDataManager(DataManager):
             available=True,
         )
         self.path_mapper.put(path=path, data_location=data_location, recursive=True)
-        self.context.checkpoint_manager.register(data_location)
+        if checkpoint:
+            self.context.checkpoint_manager.register(data_location)
         return data_location
 
     def register_relation(
@@ -165,8 +173,16 @@ class DefaultDataManager(DataManager):
         dst_connector = self.context.deployment_manager.get_connector(
             dst_locations[0].deployment
         )
-        # Create destination folder
-        await remotepath.mkdir(dst_connector, dst_locations, str(Path(dst_path).parent))
+        # Create destination folder, unless it is already available on all locations
+        dst_parent = str(Path(dst_path).parent)
+        if not all(
+            self._is_available(dst_parent, location) for location in dst_locations
+        ):
+            await remotepath.mkdir(dst_connector, dst_locations, dst_parent)
+            # Record the new folder, so that later transfers into it (e.g., secondary
+            # files) can skip the mkdir command. Empty folders need no checkpoint
+            for location in dst_locations:
+                self.register_path(location, dst_parent, checkpoint=False)
         # Follow symlink for source path
         src_path = await remotepath.follow_symlink(
             self.context, src_connector, src_location, src_path
@@ -83,10 +83,8 @@ class BaseConnector(Connector, FutureAware):
         self, src: str, dst: str, location: Location, read_only: bool = False
     ) -> None:
         proc = await asyncio.create_subprocess_exec(
-            *shlex.split(
-                self._get_run_command(
-                    command="tar xf - -C /", location=location, interactive=True
-                )
+            *self._get_run_args(
+                command="tar xf - -C /", location=location, interactive=True
             ),
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.DEVNULL,
@@ -114,11 +112,9 @@ class BaseConnector(Connector, FutureAware):
     ) -> None:
         dirname, basename = posixpath.split(src)
         proc = await asyncio.create_subprocess_exec(
-            *shlex.split(
-                self._get_run_command(
-                    command=f"tar chf - -C {dirname} {basename}",
-                    location=location,
-                )
+            *self._get_run_args(
+                command=f"tar chf - -C {dirname} {basename}",
+                location=location,
             ),
             stdin=asyncio.subprocess.DEVNULL,
             stdout=asyncio.subprocess.PIPE,
@@ -174,12 +170,10 @@ class BaseConnector(Connector, FutureAware):
                     *(
                         asyncio.create_task(
                             asyncio.create_subprocess_exec(
-                                *shlex.split(
-                                    self._get_run_command(
-                                        command=write_command,
-                                        location=location,
-                                        interactive=True,
-                                    )
+                                *self._get_run_args(
+                                    command=write_command,
+                                    location=location,
+                                    interactive=True,
                                 ),
                                 stdin=asyncio.subprocess.PIPE,
                                 stdout=asyncio.subprocess.DEVNULL,
@@ -216,6 +210,15 @@ class BaseConnector(Connector, FutureAware):
     ) -> str:
         ...
 
+    def _get_run_args(
+        self, command: str, location: Location, interactive: bool = False
+    ) -> MutableSequence[str]:
+        return shlex.split(
+            self._get_run_command(
+                command=command, location=location, interactive=interactive
+            )
+        )
+
     def _get_shell(self) -> str:
         return "sh"
 
@@ -223,11 +226,9 @@ class BaseConnector(Connector, FutureAware):
         dirname, basename = posixpath.split(src)
         return SubprocessStreamReaderWrapperContext(
             coro=asyncio.create_subprocess_exec(
-                *shlex.split(
-                    self._get_run_command(
-                        command=f"tar chf - -C {dirname} {basename}",
-                        location=location,
-                    )
+                *self._get_run_args(
+                    command=f"tar chf - -C {dirname} {basename}",
+                    location=location,
                 ),
                 stdin=asyncio.subprocess.DEVNULL,
                 stdout=asyncio.subprocess.PIPE,
@@ -352,9 +353,8 @@ class BaseConnector(Connector, FutureAware):
                 )
             )
         command = utils.encode_command(command, self._get_shell())
-        run_command = self._get_run_command(command, location)
         proc = await asyncio.create_subprocess_exec(
-            *shlex.split(run_command),
+            *self._get_run_args(command, location),
             stdin=None,
             stdout=(
                 asyncio.subprocess.PIPE
@@ -1,41 +1,372 @@
 from __future__ import annotations
 
+import asyncio
+import errno
+import functools
+import multiprocessing
 import os
+import queue
+import re
+import shlex
 import shutil
+import stat
 import sys
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import MutableMapping, MutableSequence
 
 import pkg_resources
 import psutil
+from cachetools import Cache, TTLCache, cached
 
+from streamflow.core.asyncache import cachedmethod
 from streamflow.core.deployment import Connector, LOCAL_LOCATION, Location
 from streamflow.core.scheduling import AvailableLocation, Hardware
 from streamflow.deployment.connector.base import BaseConnector
 
+if sys.platform != "win32":
+    import fcntl
 
+
+_PREALLOCATE_THRESHOLD = 2**22
+_PROCESS_COPY_THRESHOLD = 1024
+_PROCESS_COPY_WORKERS = min(8, os.cpu_count() or 1)
+
+_SHELL_METACHARACTERS = re.compile(r"[\n|&;<>()$`\\\"'*?\[\]#~=%{}!]")
+
+_FALLBACK_ERRNOS = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSOCK,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EXDEV,
+}
+
+_FICLONE = 0x40049409
+
+# Forked workers would inherit every open descriptor (e.g., shell pipes and sockets)
+_PROCESS_COPY_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_tmp_directory_created: bool = False
+
+
+def _ficlone(infd: int, outfd: int, count: int, offset: int) -> int:
+    # Clone the whole file as a copy-on-write reference to the same extents
+    fcntl.ioctl(outfd, _FICLONE, infd)
+    return count
+
+
+def _hardlink(src: str, dst: str) -> bool:
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
+
+
+def _copy_file_range(infd: int, outfd: int, count: int, offset: int) -> int:
+    return os.copy_file_range(infd, outfd, count, offset, offset)
+
+
+def _sendfile(infd: int, outfd: int, count: int, offset: int) -> int:
+    # Unlike copy_file_range, sendfile writes at the current destination offset
+    os.lseek(outfd, offset, os.SEEK_SET)
+    return os.sendfile(outfd, infd, offset, count)
+
+
+# Select the copy strategies supported by the current platform once, at import time
+_CLONE_FUNCTIONS = (_ficlone,) if sys.platform == "linux" else ()
+_COPY_FUNCTIONS = tuple(
+    copy_fn
+    for copy_fn, available in (
+        (_copy_file_range, hasattr(os, "copy_file_range")),
+        (_sendfile, hasattr(os, "sendfile")),
+    )
+    if available
+)
+_HAS_FCHMOD = hasattr(os, "fchmod")
+_HAS_POSIX_FALLOCATE = hasattr(os, "posix_fallocate")
+_HAS_FUTIMES = os.utime in os.supports_fd
+_O_NONBLOCK = getattr(os, "O_NONBLOCK", 0)
+
+
+def _kernel_copy(copy_fn, infd: int, outfd: int, size: int, offset: int = 0) -> int:
+    try:
+        # Stop as soon as the expected size is reached, saving a final empty call
+        while offset < size and (sent := copy_fn(infd, outfd, size - offset, offset)):
+            offset += sent
+    except OSError as e:
+        # Data up to the current offset is valid, so callers can resume from there
+        if e.errno not in _FALLBACK_ERRNOS:
+            raise
+    return offset
+
+
+def _copy_overlapped(fsrc, fdst, bufsize: int, buffers: int = 4) -> None:
+    chunks: queue.Queue = queue.Queue(maxsize=buffers)
+    errors = []
+    stop = threading.Event()
+
+    def _read() -> None:
+        try:
+            while not stop.is_set() and (chunk := fsrc.read(bufsize)):
+                chunks.put(chunk)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            chunks.put(None)
+
+    # Read ahead in a separate thread, so that reads and writes overlap
+    reader = threading.Thread(target=_read, daemon=True)
+    reader.start()
+    completed = False
+    try:
+        while (chunk := chunks.get()) is not None:
+            fdst.write(chunk)
+        completed = True
+    finally:
+        if not completed:
+            # Unblock the reader if it is waiting for a free buffer
+            stop.set()
+            while chunks.get() is not None:
+                pass
+        reader.join()
+    if errors:
+        raise errors[0]
+
+
+def _copy_file(
+    src: str, dst: str, bufsize: int = 2**16, hardlink: bool = False
+) -> str:
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    # Read-only copies are never modified, so they can share the source inode if allowed
+    if hardlink and _hardlink(src, dst):
+        return dst
+    # Open in non-blocking mode, so that named pipes are detected instead of waited on
+    with open(os.open(src, os.O_RDONLY | _O_NONBLOCK), "rb") as fsrc:
+        infd = fsrc.fileno()
+        src_stat = os.fstat(infd)
+        if stat.S_ISFIFO(src_stat.st_mode):
+            raise shutil.SpecialFileError(f"`{src}` is a named pipe")
+        # Opening the destination truncates it, so refuse to copy a file onto itself
+        try:
+            dst_stat = os.stat(dst)
+        except FileNotFoundError:
+            pass
+        else:
+            if os.path.samestat(src_stat, dst_stat) and os.path.realpath(
+                src
+            ) == os.path.realpath(dst):
+                raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+            # Replace hardlinks instead of writing through them, which would also
+            # modify the other linked paths (e.g., the source of a read-only copy)
+            if dst_stat.st_nlink > 1 and not os.path.islink(dst):
+                os.unlink(dst)
+        with open(dst, "wb") as fdst:
+            _copy_data(fsrc, fdst, src_stat, bufsize)
+    if not _HAS_FCHMOD:
+        shutil.copymode(src, dst)
+    if not _HAS_FUTIMES:
+        os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    return dst
+
+
+def _copy_data(fsrc, fdst, src_stat: os.stat_result, bufsize: int) -> None:
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    size, offset = src_stat.st_size, 0
+    # Let the kernel move data between file descriptors when possible. Files
+    # reporting a zero size (e.g., pseudo-files) are always copied in user space
+    if size > 0:
+        for clone_fn in _CLONE_FUNCTIONS:
+            if (offset := _kernel_copy(clone_fn, infd, outfd, size)) >= size:
+                break
+        else:
+            # Allocate large files upfront to reduce fragmentation
+            if size > _PREALLOCATE_THRESHOLD and _HAS_POSIX_FALLOCATE:
+                try:
+                    os.posix_fallocate(outfd, 0, size)
+                except OSError:
+                    pass
+            for copy_fn in _COPY_FUNCTIONS:
+                if (offset := _kernel_copy(copy_fn, infd, outfd, size, offset)) >= size:
+                    break
+    # Copy in user space whatever the kernel did not, including short copies
+    if size == 0 or offset < size:
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        if size - offset > 4 * bufsize:
+            _copy_overlapped(fsrc, fdst, bufsize)
+        else:
+            shutil.copyfileobj(fsrc, fdst, bufsize)
+    # Reuse the already open descriptors instead of resolving paths again
+    if _HAS_FCHMOD:
+        os.fchmod(outfd, stat.S_IMODE(src_stat.st_mode))
+    if _HAS_FUTIMES:
+        # Flush buffered data first, as later writes would update the timestamps
+        fdst.flush()
+        os.utime(outfd, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
+
+def _copy_files(
+    files: MutableSequence[tuple[str, str]], bufsize: int, hardlink: bool = False
+) -> None:
+    for src, dst in files:
+        _copy_file(src, dst, bufsize, hardlink)
+
+
+def _partition_files(
+    files: MutableSequence[tuple[str, str, int]], n: int
+) -> MutableSequence[MutableSequence[tuple[str, str]]]:
+    # Files are sorted by decreasing size, so assigning each of them to the
+    # lightest partition produces well-balanced chunks
+    partitions, sizes = [[] for _ in range(n)], [0] * n
+    for src, dst, size in files:
+        index = sizes.index(min(sizes))
+        partitions[index].append((src, dst))
+        sizes[index] += size
+    return [p for p in partitions if p]
+
+
+def _copy_directory_stats(dirs: MutableSequence[tuple[str, str]]) -> None:
+    # Process children before their parents, as copystat could make a parent read-only
+    for src, dst in reversed(dirs):
+        shutil.copystat(src, dst)
+
+
+def _prepare_directory_copy(
+    src: str, dst: str
+) -> tuple[MutableSequence[tuple[str, str]], MutableSequence[tuple[str, str, int]]]:
+    dirs, files, stack = [(src, dst)], [], [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                dst_path = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    dirs.append((entry.path, dst_path))
+                    stack.append((entry.path, dst_path))
+                else:
+                    files.append((entry.path, dst_path, entry.stat().st_size))
+    for _, d in dirs:
+        os.makedirs(d, exist_ok=True)
+    # Start from the largest files, so that the longest copies are not scheduled last
+    files.sort(key=lambda f: f[2], reverse=True)
+    return dirs, files
+
+
+def _create_tmp_directory() -> None:
+    os.makedirs(
+        os.path.join(os.path.realpath(tempfile.gettempdir()), "streamflow"),
+        exist_ok=True,
+    )
+
+
+def _get_cgroup_cpu_quota() -> float | None:
+    # Try cgroup v2 first, then fall back to cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        return int(quota) / int(period) if quota != "max" else None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_cores() -> float:
+    # Only count the CPUs that the current process is allowed to run on
+    if hasattr(os, "sched_getaffinity"):
+        cores = float(len(os.sched_getaffinity(0)))
+    else:
+        cores = float(os.cpu_count() or 1)
+    if sys.platform == "linux" and (quota := _get_cgroup_cpu_quota()) is not None:
+        # Fractional quotas (e.g., 500m limits) still allow running a whole process
+        cores = max(1.0, min(cores, quota))
+    return cores
+
+
+@functools.lru_cache(maxsize=1)
+def _get_memory() -> float:
+    if sys.platform == "linux":
+        try:
+            with open("/proc/meminfo", "rb") as f:
+                for line in f:
+                    if line.startswith(b"MemAvailable:"):
+                        return float(int(line.split()[1]) / 2**10)
+        except OSError:
+            pass
+    return float(psutil.virtual_memory().available / 2**20)
+
+
+@cached(TTLCache(maxsize=1024, ttl=5))
 def _get_disk_usage(path: Path):
     while not os.path.exists(path):
         path = path.parent
-    return float(shutil.disk_usage(path).free / 2**20)
+    if sys.platform == "win32":
+        return float(shutil.disk_usage(path).free / 2**20)
+    else:
+        stat = os.statvfs(path)
+        return float(stat.f_bavail * stat.f_frsize / 2**20)
 
 
 class LocalConnector(BaseConnector):
     def __init__(
-        self, deployment_name: str, config_dir: str, transferBufferSize: int = 2**16
+        self,
+        deployment_name: str,
+        config_dir: str,
+        transferBufferSize: int = 2**20,
+        hardlinkReadOnly: bool = False,
     ):
         super().__init__(deployment_name, config_dir, transferBufferSize)
-        self.cores = float(psutil.cpu_count())
-        self.memory = float(psutil.virtual_memory().available / 2**20)
+        self.hardlinkReadOnly: bool = hardlinkReadOnly
+        self.cores = _get_cores()
+        self.memory = _get_memory()
+        self.locationsCache: Cache = TTLCache(maxsize=1024, ttl=5)
+        self._process_executor: ProcessPoolExecutor | None = None
+
+    def _get_process_executor(self) -> ProcessPoolExecutor:
+        if self._process_executor is None:
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=_PROCESS_COPY_WORKERS, mp_context=_PROCESS_COPY_CONTEXT
+            )
+        return self._process_executor
 
     def _get_run_command(
         self, command: str, location: Location, interactive: bool = False
-    ):
+    ) -> str:
         if sys.platform == "win32":
             return f"{self._get_shell()} /C '{command}'"
         else:
-            return f"{self._get_shell()} -c '{command}'"
+            return f"{self._get_shell()} -c {shlex.quote(command)}"
+
+    def _get_run_args(
+        self, command: str, location: Location, interactive: bool = False
+    ) -> MutableSequence[str]:
+        # Plain `program arg ...` invocations do not need a shell process
+        if _SHELL_METACHARACTERS.search(command):
+            return [
+                self._get_shell(),
+                "/C" if sys.platform == "win32" else "-c",
+                command,
+            ]
+        else:
+            return shlex.split(command)
 
     def _get_shell(self) -> str:
         if sys.platform == "win32":
@@ -56,11 +387,53 @@ class LocalConnector(BaseConnector):
     ) -> None:
         source_connector = source_connector or self
         if source_connector == self:
+            loop = asyncio.get_running_loop()
+            hardlink = read_only and self.hardlinkReadOnly
             if os.path.isdir(src):
-                os.makedirs(dst, exist_ok=True)
-                shutil.copytree(src, dst, dirs_exist_ok=True)
+                # Create the whole directory tree before scheduling copies, so that
+                # concurrent workers never race on the same mkdir
+                dirs, files = await loop.run_in_executor(
+                    None, _prepare_directory_copy, src, dst
+                )
+                # Large trees are split among worker processes, to prevent the
+                # per-file Python overhead from being serialized by the GIL
+                if len(files) > _PROCESS_COPY_THRESHOLD:
+                    executor = self._get_process_executor()
+                    await asyncio.gather(
+                        *(
+                            loop.run_in_executor(
+                                executor,
+                                _copy_files,
+                                chunk,
+                                self.transferBufferSize,
+                                hardlink,
+                            )
+                            for chunk in _partition_files(files, _PROCESS_COPY_WORKERS)
+                        )
+                    )
+                else:
+                    semaphore = asyncio.Semaphore(min(32, (os.cpu_count() or 1) * 4))
+
+                    async def _copy(s: str, d: str) -> None:
+                        async with semaphore:
+                            await loop.run_in_executor(
+                                None,
+                                _copy_file,
+                                s,
+                                d,
+                                self.transferBufferSize,
+                                hardlink,
+                            )
+
+                    await asyncio.gather(
+                        *(asyncio.create_task(_copy(s, d)) for s, d, _ in files)
+                    )
+                # Copying files updates directory timestamps, so restore them last
+                await loop.run_in_executor(None, _copy_directory_stats, dirs)
             else:
-                shutil.copy(src, dst)
+                await loop.run_in_executor(
+                    None, _copy_file, src, dst, self.transferBufferSize, hardlink
+                )
         else:
             await super()._copy_remote_to_remote(
                 src=src,
@@ -72,9 +445,40 @@ class LocalConnector(BaseConnector):
             )
 
     async def deploy(self, external: bool) -> None:
-        os.makedirs(
-            os.path.join(os.path.realpath(tempfile.gettempdir()), "streamflow"),
-            exist_ok=True,
+        global _tmp_directory_created
+        if not _tmp_directory_created:
+            await asyncio.get_running_loop().run_in_executor(
+                None, _create_tmp_directory
+            )
+            _tmp_directory_created = True
+
+    @cachedmethod(lambda self: self.locationsCache)
+    async def _get_available_location(
+        self,
+        service: str | None = None,
+        input_directory: str | None = None,
+        output_directory: str | None = None,
+        tmp_directory: str | None = None,
+    ) -> AvailableLocation:
+        return AvailableLocation(
+            name=LOCAL_LOCATION,
+            deployment=self.deployment_name,
+            service=service,
+            hostname="localhost",
+            slots=1,
+            hardware=Hardware(
+                cores=self.cores,
+                memory=self.memory,
+                input_directory=_get_disk_usage(Path(input_directory))
+                if input_directory
+                else float("inf"),
+                output_directory=_get_disk_usage(Path(output_directory))
+                if output_directory
+                else float("inf"),
+                tmp_directory=_get_disk_usage(Path(tmp_directory))
+                if tmp_directory
+                else float("inf"),
+            ),
         )
 
     async def get_available_locations(
@@ -84,26 +488,13 @@ class LocalConnector(BaseConnector):
         output_directory: str | None = None,
         tmp_directory: str | None = None,
     ) -> MutableMapping[str, AvailableLocation]:
+        # Only the location is cached, so that callers can freely modify the mapping
         return {
-            LOCAL_LOCATION: AvailableLocation(
-                name=LOCAL_LOCATION,
-                deployment=self.deployment_name,
+            LOCAL_LOCATION: await self._get_available_location(
                 service=service,
-                hostname="localhost",
-                slots=1,
-                hardware=Hardware(
-                    cores=self.cores,
-                    memory=self.memory,
-                    input_directory=_get_disk_usage(Path(input_directory))
-                    if input_directory
-                    else float("inf"),
-                    output_directory=_get_disk_usage(Path(output_directory))
-                    if output_directory
-                    else float("inf"),
-                    tmp_directory=_get_disk_usage(Path(tmp_directory))
-                    if tmp_directory
-                    else float("inf"),
-                ),
+                input_directory=input_directory,
+                output_directory=output_directory,
+                tmp_directory=tmp_directory,
             )
         }
 
@@ -114,4 +505,6 @@ class LocalConnector(BaseConnector):
         )
 
     async def undeploy(self, external: bool) -> None:
-        pass
+        if (executor := self._process_executor) is not None:
+            self._process_executor = None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
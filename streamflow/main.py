@@ -14,6 +14,7 @@ from streamflow.config.validator import SfValidator
 from streamflow.core.context import StreamFlowContext
 from streamflow.core.exception import WorkflowProvenanceException
 from streamflow.core.provenance import ProvenanceManager
+from streamflow.core.utils import install_event_loop_policy
 from streamflow.core.workflow import Workflow
 from streamflow.cwl.main import main as cwl_main
 from streamflow.data import data_manager_classes
@@ -244,6 +245,7 @@ def build_context(config: MutableMapping[str, Any]) -> StreamFlowContext:
 def main(args):
     try:
         args = parser.parse_args(args)
+        install_event_loop_policy()
         if args.context == "version":
             from streamflow.version import VERSION
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import os
 from typing import Any, MutableMapping, MutableSequence
@@ -146,19 +145,11 @@ class SqliteDatabase(CachedDatabase):
                 return cursor.lastrowid
 
     async def add_provenance(self, inputs: MutableSequence[int], token: int):
-        provenance = [{"dependee": i, "depender": token} for i in inputs]
-        async with self.connection as db:
-            await asyncio.gather(
-                *(
-                    asyncio.create_task(
-                        db.execute(
-                            "INSERT OR IGNORE INTO provenance(dependee, depender) "
-                            "VALUES(:dependee, :depender)",
-                            prov,
-                        )
-                    )
-                    for prov in provenance
-                )
+        async with self.connection as db:
+            await db.executemany(
+                "INSERT OR IGNORE INTO provenance(dependee, depender) "
+                "VALUES(:dependee, :depender)",
+                [{"dependee": i, "depender": token} for i in inputs],
             )
 
     async def add_step(
@@ -211,7 +202,8 @@ class SqliteDatabase(CachedDatabase):
         self, tag: str, type: type[Token], value: Any, port: int | None = None
     ):
         async with self.connection as db:
-            async with db.execute(
+            # Insert and retrieve the row id with a single call to the database thread
+            row = await db.execute_insert(
                 "INSERT INTO token(port, type, tag, value) "
                 "VALUES(:port, :type, :tag, :value)",
                 {
@@ -220,8 +212,8 @@ class SqliteDatabase(CachedDatabase):
                     "tag": tag,
                     "value": value,
                 },
-            ) as cursor:
-                return cursor.lastrowid
+            )
+            return row[0]
 
     async def add_workflow(
         self, name: str, params: MutableMapping[str, Any], status: int, type: str
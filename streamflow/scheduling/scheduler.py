@@ -170,8 +170,8 @@ class DefaultScheduler(Scheduler):
             running_jobs = list(
                 filter(
                     lambda x: (
-                        self.job_allocations[x].status == Status.RUNNING
-                        or self.job_allocations[x].status == Status.FIREABLE
+                        self.job_allocations[x].status is Status.RUNNING
+                        or self.job_allocations[x].status is Status.FIREABLE
                     ),
                     self.location_allocations[location.deployment][location.name].jobs,
                 )
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import posixpath
 from abc import ABC, abstractmethod
 from collections import deque
-from types import ModuleType
 from typing import (
     Any,
     AsyncIterable,
@@ -19,7 +19,7 @@ from typing import (
 from streamflow.core import utils
 from streamflow.core.config import BindingConfig
 from streamflow.core.context import StreamFlowContext
-from streamflow.core.deployment import Connector, DeploymentConfig, Location, Target
+from streamflow.core.deployment import Connector, DeploymentConfig, Location
 from streamflow.core.exception import (
     FailureHandlingException,
     WorkflowDefinitionException,
@@ -41,41 +41,92 @@ from streamflow.data import remotepath
 from streamflow.deployment.utils import get_path_processor
 from streamflow.log_handler import logger
 from streamflow.workflow.port import ConnectorPort, JobPort
-from streamflow.workflow.token import JobToken, ListToken, TerminationToken
+from streamflow.workflow.token import (
+    IterationTerminationToken,
+    JobToken,
+    ListToken,
+    TerminationToken,
+)
 from streamflow.workflow.utils import (
     check_iteration_termination,
     check_termination,
     get_job_token,
+    get_tag_prefix,
 )
 
 
-def _get_directory(path_processor: ModuleType, directory: str | None, target: Target):
-    return directory or path_processor.join(target.workdir, utils.random_name())
+def _handle_step_exceptions(func):
+    @functools.wraps(func)
+    async def wrapper(self: BaseStep, *args, **kwargs):
+        try:
+            return await func(self, *args, **kwargs)
+        # When receiving a KeyboardInterrupt, propagate it (to allow debugging)
+        except KeyboardInterrupt:
+            raise
+        # When receiving a CancelledError, mark the step as Cancelled
+        except asyncio.CancelledError:
+            await self.terminate(Status.CANCELLED)
+        except Exception as e:
+            logger.exception(e)
+            await self.terminate(Status.FAILED)
+
+    return wrapper
 
 
-def _get_step_status(statuses: MutableSequence[Status]):
-    num_skipped = 0
+def _get_step_status(statuses: Iterable[Status]):
+    num_statuses, num_skipped = 0, 0
     for status in statuses:
-        if status == Status.FAILED:
+        num_statuses += 1
+        if status is Status.FAILED:
             return Status.FAILED
-        elif status == Status.CANCELLED:
+        elif status is Status.CANCELLED:
             return Status.CANCELLED
-        elif status == Status.SKIPPED:
+        elif status is Status.SKIPPED:
             num_skipped += 1
-    if num_skipped == len(statuses):
+    if num_skipped == num_statuses:
         return Status.SKIPPED
     else:
         return Status.COMPLETED
 
 
+async def _get_queued_token(queue: asyncio.Queue) -> tuple[str, Token]:
+    port_name, token = await queue.get()
+    # Port readers forward their failures through the queue
+    if isinstance(token, BaseException):
+        raise token
+    return port_name, token
+
+
+def _get_pending_tasks(
+    tasks: MutableSequence[asyncio.Task],
+) -> MutableSequence[asyncio.Task]:
+    pending = []
+    for task in tasks:
+        if task.done():
+            # Raise the exceptions of completed tasks
+            task.result()
+        else:
+            pending.append(task)
+    return pending
+
+
 def _group_by_tag(
     inputs: MutableMapping[str, Token],
     inputs_map: MutableMapping[str, MutableMapping[str, Token]],
-) -> None:
+    num_ports: int,
+) -> MutableSequence[tuple[str, MutableMapping[str, Token]]]:
+    ready = []
     for name, token in inputs.items():
-        if token.tag not in inputs_map:
-            inputs_map[token.tag] = {}
-        inputs_map[token.tag][name] = token
+        tag_inputs = inputs_map.setdefault(token.tag, {})
+        tag_inputs[name] = token
+        # Remove complete groups as soon as they are detected
+        if len(tag_inputs) == num_ports:
+            ready.append((token.tag, inputs_map.pop(token.tag)))
+    return ready
+
+
+def _get_tag_key(token: Token) -> tuple[int, ...]:
+    return tuple(int(i) for i in token.tag.split("."))
 
 
 def _get_token_ids(token_list):
@@ -83,31 +134,63 @@ def _get_token_ids(token_list):
 
 
 class BaseStep(Step, ABC):
+    __slots__ = ("_consumers", "_log_level")
+
     def __init__(self, name: str, workflow: Workflow):
         super().__init__(name, workflow)
+        self._consumers: MutableMapping[str, str] = {}
         self._log_level: int = logging.DEBUG
 
+    def _get_consumer(self, port_name: str) -> str:
+        if (consumer := self._consumers.get(port_name)) is None:
+            consumer = self._consumers[port_name] = posixpath.join(self.name, port_name)
+        return consumer
+
     async def _get_inputs(self, input_ports: MutableMapping[str, Port]):
-        inputs = {
-            k: v
-            for k, v in zip(
-                input_ports.keys(),
-                await asyncio.gather(
-                    *(
-                        asyncio.create_task(p.get(posixpath.join(self.name, port_name)))
-                        for port_name, p in input_ports.items()
-                    )
-                ),
+        if len(input_ports) == 1:
+            # Skip the gather machinery when there is a single port to read
+            port_name, port = next(iter(input_ports.items()))
+            inputs = {port_name: await port.get(self._get_consumer(port_name))}
+        else:
+            inputs = dict(
+                zip(
+                    input_ports.keys(),
+                    await asyncio.gather(
+                        *(
+                            p.get(self._get_consumer(port_name))
+                            for port_name, p in input_ports.items()
+                        )
+                    ),
+                )
             )
-        }
         if logger.isEnabledFor(logging.DEBUG):
-            if check_termination(inputs):
+            if check_termination(inputs.values()):
                 logger.debug(f"Step {self.name} received termination token")
             logger.debug(
                 f"Step {self.name} received inputs {[t.tag for t in inputs.values()]}"
             )
         return inputs
 
+    async def _read_port(
+        self,
+        port_name: str,
+        port: Port,
+        queue: asyncio.Queue,
+        stop_on_termination: bool = True,
+    ) -> None:
+        consumer = self._get_consumer(port_name)
+        try:
+            while True:
+                token = await port.get(consumer)
+                await queue.put((port_name, token))
+                if stop_on_termination and isinstance(token, TerminationToken):
+                    break
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            # Readers are never awaited, so the consumer must re-raise the failure
+            queue.put_nowait((port_name, e))
+
     async def _persist_token(
         self, token: Token, port: Port, input_token_ids: Iterable[int]
     ) -> Token:
@@ -126,18 +209,16 @@ class BaseStep(Step, ABC):
         if not self.terminated:
             self.terminated = True
             # If not explicitly cancelled, close input ports
-            if status != Status.CANCELLED:
+            if status is not Status.CANCELLED:
                 for port_name, port in self.get_input_ports().items():
-                    port.close(posixpath.join(self.name, port_name))
+                    port.close(self._get_consumer(port_name))
             # Add a TerminationToken to each output port
             for port in self.get_output_ports().values():
                 port.put(TerminationToken())
             # Set termination status
             await self._set_status(status)
-            logger.log(
-                self._log_level,
-                f"{status.name} Step {self.name}",
-            )
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"{status.name} Step {self.name}")
 
 
 class Combinator(ABC):
@@ -183,10 +264,7 @@ class Combinator(ABC):
     def add_combinator(self, combinator: Combinator, items: set[str]) -> None:
         self.combinators[combinator.name] = combinator
         self.items.append(combinator.name)
-        self.combinators_map = {
-            **self.combinators_map,
-            **{p: combinator.name for p in items},
-        }
+        self.combinators_map.update({p: combinator.name for p in items})
 
     def add_item(self, item: str) -> None:
         self.items.append(item)
@@ -243,21 +321,18 @@ class Combinator(ABC):
             else token.tag
         )
         if depth:
-            tag = ".".join(tag.split(".")[:-depth])
+            tag = get_tag_prefix(tag, depth)
         for key in list(self.token_values.keys()):
             if tag == key:
                 continue
             elif key.startswith(tag):
                 self._add_to_port(token, self.token_values[key], port_name)
             elif tag.startswith(key):
-                if tag not in self.token_values:
-                    self.token_values[tag] = {}
+                tag_values = self.token_values.setdefault(tag, {})
                 for p in self.token_values[key]:
                     for t in self.token_values[key][p]:
-                        self._add_to_port(t, self.token_values[tag], p)
-        if tag not in self.token_values:
-            self.token_values[tag] = {}
-        self._add_to_port(token, self.token_values[tag], port_name)
+                        self._add_to_port(t, tag_values, p)
+        self._add_to_port(token, self.token_values.setdefault(tag, {}), port_name)
 
     def _add_to_port(
         self,
@@ -265,12 +340,12 @@ class Combinator(ABC):
         tag_values: MutableMapping[str, MutableSequence[Any]],
         port_name: str,
     ):
-        if port_name not in tag_values:
-            tag_values[port_name] = deque()
-        tag_values[port_name].append(token)
+        tag_values.setdefault(port_name, deque()).append(token)
 
 
 class CombinatorStep(BaseStep):
+    __slots__ = ("combinator",)
+
     def __init__(self, name: str, workflow: Workflow, combinator: Combinator):
         super().__init__(name, workflow)
         self.combinator: Combinator = combinator
@@ -303,60 +378,49 @@ class CombinatorStep(BaseStep):
         # Set default status to SKIPPED
         status = Status.SKIPPED
         if self.input_ports:
-            input_tasks, terminated = [], []
-            for port_name, port in self.get_input_ports().items():
-                input_tasks.append(
-                    asyncio.create_task(
-                        port.get(posixpath.join(self.name, port_name)), name=port_name
-                    )
-                )
-            while input_tasks:
-                # Wait for the next token
-                finished, unfinished = await asyncio.wait(
-                    input_tasks, return_when=asyncio.FIRST_COMPLETED
-                )
-                input_tasks = list(unfinished)
-                for task in finished:
-                    task_name = cast(asyncio.Task, task).get_name()
-                    token = task.result()
+            output_ports = self.get_output_ports()
+            # Multiplex all the input ports into a single queue
+            queue = asyncio.Queue()
+            readers = [
+                asyncio.create_task(self._read_port(port_name, port, queue))
+                for port_name, port in self.get_input_ports().items()
+            ]
+            try:
+                active = len(readers)
+                while active:
+                    # Wait for the next token
+                    port_name, token = await _get_queued_token(queue)
                     # If a TerminationToken is received, the corresponding port terminated its outputs
-                    if check_termination(token):
+                    if isinstance(token, TerminationToken):
                         if logger.isEnabledFor(logging.DEBUG):
                             logger.debug(
-                                f"Step {self.name} received termination token for port {task_name}"
+                                f"Step {self.name} received termination token for port {port_name}"
                             )
-                        terminated.append(task_name)
+                        active -= 1
                     # Otherwise, build combination and set default status to COMPLETED
                     else:
                         if logger.isEnabledFor(logging.DEBUG):
                             logger.debug(
-                                f"Step {self.name} received token {token.tag} on port {task_name}"
+                                f"Step {self.name} received token {token.tag} on port {port_name}"
                             )
                         status = Status.COMPLETED
                         async for schema in cast(
                             AsyncIterable,
-                            self.combinator.combine(task_name, token),
+                            self.combinator.combine(port_name, token),
                         ):
                             ins = [id for t in schema.values() for id in t["input_ids"]]
-                            for port_name, token in schema.items():
-                                self.get_output_port(port_name).put(
+                            for out_port_name, out_token in schema.items():
+                                output_port = output_ports[out_port_name]
+                                output_port.put(
                                     await self._persist_token(
-                                        token=token["token"],
-                                        port=self.get_output_port(port_name),
+                                        token=out_token["token"],
+                                        port=output_port,
                                         input_token_ids=ins,
                                     )
                                 )
-
-                    # Create a new task in place of the completed one if the port is not terminated
-                    if task_name not in terminated:
-                        input_tasks.append(
-                            asyncio.create_task(
-                                self.get_input_ports()[task_name].get(
-                                    posixpath.join(self.name, task_name)
-                                ),
-                                name=task_name,
-                            )
-                        )
+            finally:
+                for reader in readers:
+                    reader.cancel()
         # Terminate step
         await self.terminate(status)
 
@@ -377,45 +441,33 @@ class ConditionalStep(BaseStep):
     async def _on_false(self, inputs: MutableMapping[str, Token]):
         ...
 
+    @_handle_step_exceptions
     async def run(self):
-        try:
-            if self.input_ports:
-                inputs_map = {}
-                while True:
-                    # Retrieve input tokens
-                    inputs = await self._get_inputs(self.get_input_ports())
-                    # Check for termination
-                    if check_termination(inputs.values()):
-                        break
-                    # Group inputs by tag
-                    _group_by_tag(inputs, inputs_map)
-                    # Process tags
-                    for tag in list(inputs_map.keys()):
-                        if len(inputs_map[tag]) == len(self.input_ports):
-                            inputs = inputs_map.pop(tag)
-                            # If condition is satisfied (or null)
-                            if await self._eval(inputs):
-                                await self._on_true(inputs)
-                            # Otherwise
-                            else:
-                                await self._on_false(inputs)
+        if self.input_ports:
+            input_ports = self.get_input_ports()
+            inputs_map = {}
+            while True:
+                # Retrieve input tokens
+                tokens = await self._get_inputs(input_ports)
+                # Check for termination
+                if check_termination(tokens.values()):
+                    break
+                # Group inputs by tag and process the complete ones
+                for _, inputs in _group_by_tag(tokens, inputs_map, len(input_ports)):
+                    # If condition is satisfied (or null)
+                    if await self._eval(inputs):
+                        await self._on_true(inputs)
+                    # Otherwise
+                    else:
+                        await self._on_false(inputs)
+        else:
+            # If condition is satisfied (or null)
+            if await self._eval({}):
+                await self._on_true({})
+            # Otherwise
             else:
-                # If condition is satisfied (or null)
-                if await self._eval({}):
-                    await self._on_true({})
-                # Otherwise
-                else:
-                    await self._on_false({})
-            await self.terminate(Status.COMPLETED)
-        # When receiving a KeyboardInterrupt, propagate it (to allow debugging)
-        except KeyboardInterrupt:
-            raise
-        # When receiving a CancelledError, mark the step as Cancelled
-        except asyncio.CancelledError:
-            await self.terminate(Status.CANCELLED)
-        except Exception as e:
-            logger.exception(e)
-            await self.terminate(Status.FAILED)
+                await self._on_false({})
+        await self.terminate(Status.COMPLETED)
 
 
 class DefaultCommandOutputProcessor(CommandOutputProcessor):
@@ -429,6 +481,8 @@ class DefaultCommandOutputProcessor(CommandOutputProcessor):
 
 
 class DeployStep(BaseStep):
+    __slots__ = ("deployment_config",)
+
     def __init__(
         self,
         name: str,
@@ -494,42 +548,38 @@ class DeployStep(BaseStep):
                 "Scatter step must contain a single output port."
             )
         try:
-            if self.input_ports:
+            deployment_manager = self.workflow.context.deployment_manager
+            output_port = self.get_output_port()
+            if input_ports := self.get_input_ports():
                 inputs_map = {}
                 while True:
                     # Wait for input tokens to be available
-                    inputs = await self._get_inputs(self.get_input_ports())
+                    tokens = await self._get_inputs(input_ports)
                     # Check for termination
-                    if check_termination(inputs.values()):
+                    if check_termination(tokens.values()):
                         break
-                    # Group inputs by tag
-                    _group_by_tag(inputs, inputs_map)
-                    # Process tags
-                    for tag in list(inputs_map.keys()):
-                        if len(inputs_map[tag]) == len(self.input_ports):
-                            inputs_map.pop(tag)
-                            # Deploy the target
-                            await self.workflow.context.deployment_manager.deploy(
-                                self.deployment_config
-                            )
-                            # Propagate the connector in the output port
-                            self.get_output_port().put(
-                                await self.persist_token(
-                                    token=Token(value=self.deployment_config.name),
-                                    port=self.get_output_port(),
-                                    inputs=_get_token_ids(inputs.values()),
-                                )
+                    # Group inputs by tag and process the complete ones
+                    for _, inputs in _group_by_tag(
+                        tokens, inputs_map, len(input_ports)
+                    ):
+                        # Deploy the target
+                        await deployment_manager.deploy(self.deployment_config)
+                        # Propagate the connector in the output port
+                        output_port.put(
+                            await self._persist_token(
+                                token=Token(value=self.deployment_config.name),
+                                port=output_port,
+                                input_token_ids=_get_token_ids(inputs.values()),
                             )
+                        )
             else:
                 # Deploy the target
-                await self.workflow.context.deployment_manager.deploy(
-                    self.deployment_config
-                )
+                await deployment_manager.deploy(self.deployment_config)
                 # Propagate the connector in the output port
-                self.get_output_port().put(
+                output_port.put(
                     await self._persist_token(
                         token=Token(value=self.deployment_config.name),
-                        port=self.get_output_port(),
+                        port=output_port,
                         input_token_ids=[],
                     )
                 )
@@ -546,6 +596,12 @@ class DeployStep(BaseStep):
 
 
 class ExecuteStep(BaseStep):
+    __slots__ = (
+        "command",
+        "output_connectors",
+        "output_processors",
+    )
+
     def __init__(self, name: str, workflow: Workflow, job_port: JobPort):
         super().__init__(name, workflow)
         self._log_level: int = logging.INFO
@@ -635,6 +691,7 @@ class ExecuteStep(BaseStep):
         )
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"Job {job.name} started")
+        context = self.workflow.context
         # Initialise command output with default values
         command_output = CommandOutput(value=None, status=Status.FAILED)
         # TODO: Trigger location deployment in case of lazy environments
@@ -642,18 +699,14 @@ class ExecuteStep(BaseStep):
             # Execute job
             if not self.terminated:
                 self.status = Status.RUNNING
-            await self.workflow.context.scheduler.notify_status(
-                job.name, Status.RUNNING
-            )
+            await context.scheduler.notify_status(job.name, Status.RUNNING)
             command_output = await self.command.execute(job)
-            if command_output.status == Status.FAILED:
+            if command_output.status is Status.FAILED:
                 logger.error(
                     f"FAILED Job {job.name} with error:\n\t{command_output.value}"
                 )
-                command_output = (
-                    await self.workflow.context.failure_manager.handle_failure(
-                        job, self, command_output
-                    )
+                command_output = await context.failure_manager.handle_failure(
+                    job, self, command_output
                 )
         # When receiving a KeyboardInterrupt, propagate it (to allow debugging)
         except KeyboardInterrupt:
@@ -670,10 +723,8 @@ class ExecuteStep(BaseStep):
         except Exception as e:
             logger.exception(e)
             try:
-                command_output = (
-                    await self.workflow.context.failure_manager.handle_exception(
-                        job, self, e
-                    )
+                command_output = await context.failure_manager.handle_exception(
+                    job, self, e
                 )
             # If failure cannot be recovered, simply fail
             except Exception as ie:
@@ -683,22 +734,18 @@ class ExecuteStep(BaseStep):
                 await self.terminate(command_output.status)
         finally:
             # Notify completion to scheduler
-            await self.workflow.context.scheduler.notify_status(
-                job.name, command_output.status
-            )
+            await context.scheduler.notify_status(job.name, command_output.status)
         # Retrieve output tokens
         if not self.terminated:
             try:
                 await asyncio.gather(
                     *(
-                        asyncio.create_task(
-                            self._retrieve_output(
-                                job=job,
-                                output_name=output_name,
-                                output_port=self.workflow.ports[output_port],
-                                command_output=command_output,
-                                connector=connectors.get(output_name),
-                            )
+                        self._retrieve_output(
+                            job=job,
+                            output_name=output_name,
+                            output_port=self.workflow.ports[output_port],
+                            command_output=command_output,
+                            connector=connectors.get(output_name),
                         )
                         for output_name, output_port in self.output_ports.items()
                     )
@@ -757,9 +804,7 @@ class ExecuteStep(BaseStep):
                 connector_ports.keys(),
                 await asyncio.gather(
                     *(
-                        asyncio.create_task(
-                            p.get_connector(posixpath.join(self.name, port_name))
-                        )
+                        p.get_connector(self._get_consumer(port_name))
                         for port_name, p in connector_ports.items()
                     )
                 ),
@@ -771,52 +816,44 @@ class ExecuteStep(BaseStep):
             for k, v in self.get_input_ports().items()
             if k != "__job__" and not isinstance(v, ConnectorPort)
         }
+        job_port = cast(JobPort, self.get_input_port("__job__"))
         if input_ports:
             inputs_map = {}
             while True:
                 # Retrieve input tokens
-                inputs = await self._get_inputs(input_ports)
+                tokens = await self._get_inputs(input_ports)
                 # Retrieve job
-                job = await cast(JobPort, self.get_input_port("__job__")).get_job(
-                    self.name
-                )
+                job = await job_port.get_job(self.name)
                 # Check for termination
-                if check_termination(inputs.values()) or job is None:
+                if check_termination(tokens.values()) or job is None:
                     break
-                # Group inputs by tag
-                _group_by_tag(inputs, inputs_map)
-                # Process tags
-                for tag in list(inputs_map.keys()):
-                    if len(inputs_map[tag]) == len(input_ports):
-                        inputs = inputs_map.pop(tag)
-                        # Set status to fireable
-                        await self._set_status(Status.FIREABLE)
-                        # Run job
-                        jobs.append(
-                            asyncio.create_task(
-                                self._run_job(job, inputs, connectors),
-                                name=utils.random_name(),
-                            )
+                # Group inputs by tag and process the complete ones
+                for _, inputs in _group_by_tag(tokens, inputs_map, len(input_ports)):
+                    # Set status to fireable
+                    await self._set_status(Status.FIREABLE)
+                    # Run job
+                    jobs.append(
+                        asyncio.create_task(
+                            self._run_job(job, inputs, connectors),
+                            name=utils.random_name(),
                         )
+                    )
         # Otherwise simply run job
         else:
             # Retrieve job
-            if (
-                job := await cast(JobPort, self.get_input_port("__job__")).get_job(
-                    self.name
-                )
-            ) is not None:
+            if (job := await job_port.get_job(self.name)) is not None:
                 jobs.append(
                     asyncio.create_task(
-                        self._run_job(job, {}, connectors), name=utils.random_name()
+                        self._run_job(job, {}, connectors),
+                        name=utils.random_name(),
                     )
                 )
-        # Wait for jobs termination
-        statuses = cast(MutableSequence[Status], await asyncio.gather(*jobs))
+        # Wait for jobs termination, collecting statuses as they complete
+        statuses = [await coro for coro in asyncio.as_completed(jobs)]
         # If there are connector ports, retrieve termination tokens from them
         await asyncio.gather(
             *(
-                asyncio.create_task(p.get(posixpath.join(self.name, port_name)))
+                p.get(self._get_consumer(port_name))
                 for port_name, p in connector_ports.items()
             )
         )
@@ -825,10 +862,32 @@ class ExecuteStep(BaseStep):
 
 
 class GatherStep(BaseStep):
-    def __init__(self, name: str, workflow: Workflow, depth: int = 1):
+    __slots__ = ("depth", "size_map", "token_map")
+
+    def __init__(
+        self,
+        name: str,
+        workflow: Workflow,
+        depth: int = 1,
+        size_port: Port | None = None,
+    ):
         super().__init__(name, workflow)
         self.depth: int = depth
+        self.size_map: MutableMapping[str, int] = {}
         self.token_map: MutableMapping[str, MutableSequence[Token]] = {}
+        if size_port is not None:
+            self.add_input_port("__size__", size_port)
+
+    async def _gather(self, key: str, output_port: Port) -> None:
+        tokens = self.token_map.pop(key)
+        self.size_map.pop(key, None)
+        output_port.put(
+            await self._persist_token(
+                token=ListToken(tag=key, value=sorted(tokens, key=_get_tag_key)),
+                port=output_port,
+                input_token_ids=_get_token_ids(tokens),
+            )
+        )
 
     @classmethod
     async def _load(
@@ -842,6 +901,11 @@ class GatherStep(BaseStep):
             name=row["name"],
             workflow=await loading_context.load_workflow(context, row["workflow"]),
             depth=params["depth"],
+            size_port=(
+                await loading_context.load_port(context, params["size_port"])
+                if params.get("size_port") is not None
+                else None
+            ),
         )
 
     async def _save_additional_params(
@@ -849,11 +913,18 @@ class GatherStep(BaseStep):
     ) -> MutableMapping[str, Any]:
         return {
             **await super()._save_additional_params(context),
-            **{"depth": self.depth},
+            **{
+                "depth": self.depth,
+                "size_port": (
+                    size_port.persistent_id
+                    if (size_port := self.get_size_port()) is not None
+                    else None
+                ),
+            },
         }
 
     def add_input_port(self, name: str, port: Port) -> None:
-        if not self.input_ports or name in self.input_ports:
+        if name == "__size__" or self.input_ports.keys() <= {name, "__size__"}:
             super().add_input_port(name, port)
         else:
             raise WorkflowDefinitionException(
@@ -868,8 +939,18 @@ class GatherStep(BaseStep):
                 f"{self.name} step must contain a single output port."
             )
 
+    def get_input_port(self, name: str | None = None) -> Port:
+        # The size port is never the default input port
+        if name is None and "__size__" in self.input_ports:
+            if len(port_names := self.input_ports.keys() - {"__size__"}) == 1:
+                name = next(iter(port_names))
+        return super().get_input_port(name)
+
+    def get_size_port(self) -> Port | None:
+        return self.get_input_port("__size__")
+
     async def run(self):
-        if len(self.input_ports) != 1:
+        if len(self.input_ports.keys() - {"__size__"}) != 1:
             raise WorkflowDefinitionException(
                 f"{self.name} step must contain a single input port."
             )
@@ -877,36 +958,45 @@ class GatherStep(BaseStep):
             raise WorkflowDefinitionException(
                 f"{self.name} step must contain a single output port."
             )
-        input_port = self.get_input_port()
-        while True:
-            token = await input_port.get(
-                posixpath.join(self.name, next(iter(self.input_ports)))
-            )
-            if check_termination(token):
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.debug(f"Step {self.name} received termination token")
-                output_port = self.get_output_port()
-                for tag, tokens in self.token_map.items():
-                    output_port.put(
-                        await self._persist_token(
-                            token=ListToken(
-                                tag=tag, value=sorted(tokens, key=lambda cur: cur.tag)
-                            ),
-                            port=output_port,
-                            input_token_ids=_get_token_ids(tokens),
-                        )
-                    )
-                break
-            else:
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.debug(f"Step {self.name} received input {token.tag}")
-                key = ".".join(token.tag.split(".")[: -self.depth])
-                if key not in self.token_map:
-                    self.token_map[key] = []
-                self.token_map[key].append(token)
+        output_port = self.get_output_port()
+        # Multiplex the input port and the optional size port into a single queue
+        queue = asyncio.Queue()
+        readers = [
+            asyncio.create_task(self._read_port(port_name, port, queue))
+            for port_name, port in self.get_input_ports().items()
+        ]
+        try:
+            while True:
+                port_name, token = await _get_queued_token(queue)
+                # Sizes allow to emit each group as soon as it is complete
+                if port_name == "__size__":
+                    if not isinstance(token, TerminationToken):
+                        self.size_map[token.tag] = token.value
+                        if (tokens := self.token_map.get(token.tag)) and len(
+                            tokens
+                        ) == token.value:
+                            await self._gather(token.tag, output_port)
+                elif isinstance(token, TerminationToken):
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Step {self.name} received termination token")
+                    # Flush groups whose size is unknown
+                    for key in list(self.token_map.keys()):
+                        await self._gather(key, output_port)
+                    break
+                else:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Step {self.name} received input {token.tag}")
+                    key = get_tag_prefix(token.tag, self.depth)
+                    tokens = self.token_map.setdefault(key, [])
+                    tokens.append(token)
+                    if len(tokens) == self.size_map.get(key):
+                        await self._gather(key, output_port)
+        finally:
+            for reader in readers:
+                reader.cancel()
         # Terminate step
         await self.terminate(
-            Status.SKIPPED if self.get_output_port().empty() else Status.COMPLETED
+            Status.SKIPPED if output_port.empty() else Status.COMPLETED
         )
 
 
@@ -964,41 +1054,34 @@ class InputInjectorStep(BaseStep, ABC):
                 f"{self.name} step must contain a single output port."
             )
         if input_ports:
+            job_port = cast(JobPort, self.get_input_port("__job__"))
+            output_port = self.get_output_port()
+            scheduler = self.workflow.context.scheduler
             while True:
                 # Retrieve input token
                 token = next(iter((await self._get_inputs(input_ports)).values()))
                 # Retrieve job
-                job = await cast(JobPort, self.get_input_port("__job__")).get_job(
-                    self.name
-                )
+                job = await job_port.get_job(self.name)
                 # Check for termination
-                if check_termination(token) or job is None:
+                if isinstance(token, TerminationToken) or job is None:
                     break
                 try:
-                    await self.workflow.context.scheduler.notify_status(
-                        job.name, Status.RUNNING
-                    )
-                    in_list = [
-                        get_job_token(
-                            job.name, self.get_input_port("__job__").token_list
-                        )
-                    ]
+                    await scheduler.notify_status(job.name, Status.RUNNING)
+                    in_list = [get_job_token(job.name, job_port.token_list)]
                     # if token.persistent is none it means it comes from the dataset
                     if token.persistent_id:
                         in_list.append(token)
                     # Process value and inject token in the output port
-                    self.get_output_port().put(
+                    output_port.put(
                         await self._persist_token(
                             token=await self.process_input(job, token.value),
-                            port=self.get_output_port(),
+                            port=output_port,
                             input_token_ids=_get_token_ids(in_list),
                         )
                     )
                 finally:
                     # Notify completion to scheduler
-                    await self.workflow.context.scheduler.notify_status(
-                        job.name, Status.COMPLETED
-                    )
+                    await scheduler.notify_status(job.name, Status.COMPLETED)
         # Terminate step
         await self.terminate(
             Status.SKIPPED if self.get_output_port().empty() else Status.COMPLETED
@@ -1006,6 +1089,8 @@ class InputInjectorStep(BaseStep, ABC):
 
 
 class LoopCombinatorStep(CombinatorStep):
+    __slots__ = ("iteration_terminaton_checklist",)
+
     def __init__(self, name: str, workflow: Workflow, combinator: Combinator):
         super().__init__(name, workflow, combinator)
         self.iteration_terminaton_checklist: MutableMapping[str, set[str]] = {}
@@ -1014,88 +1099,82 @@ class LoopCombinatorStep(CombinatorStep):
         # Set default status to SKIPPED
         status = Status.SKIPPED
         if self.input_ports:
-            input_tasks, terminated = [], []
+            # Multiplex all the input ports into a single queue. Ports can still
+            # receive tokens for pending iterations after a TerminationToken
+            output_ports = self.get_output_ports()
+            queue = asyncio.Queue()
+            readers = []
             for port_name, port in self.get_input_ports().items():
                 self.iteration_terminaton_checklist[port_name] = set()
-                input_tasks.append(
+                readers.append(
                     asyncio.create_task(
-                        port.get(posixpath.join(self.name, port_name)), name=port_name
+                        self._read_port(
+                            port_name, port, queue, stop_on_termination=False
+                        )
                     )
                 )
-            while input_tasks:
-                # Wait for the next token
-                finished, unfinished = await asyncio.wait(
-                    input_tasks, return_when=asyncio.FIRST_COMPLETED
-                )
-                input_tasks = list(unfinished)
-                for task in finished:
-                    task_name = cast(asyncio.Task, task).get_name()
-                    token = task.result()
+            try:
+                terminated, finished = set(), set()
+                while len(finished) < len(readers):
+                    # Wait for the next token
+                    port_name, token = await _get_queued_token(queue)
+                    if port_name in finished:
+                        continue
+                    checklist = self.iteration_terminaton_checklist[port_name]
                     # If a TerminationToken is received, the corresponding port terminated its outputs
-                    if check_termination(token):
+                    if isinstance(token, TerminationToken):
                         if logger.isEnabledFor(logging.DEBUG):
                             logger.debug(
-                                f"Step {self.name} received termination token for port {task_name}"
+                                f"Step {self.name} received termination token for port {port_name}"
                             )
-                        terminated.append(task_name)
+                        terminated.add(port_name)
                     # If an IterationTerminationToken is received, mark the corresponding iteration as terminated
-                    elif check_iteration_termination(token):
-                        if token.tag in self.iteration_terminaton_checklist[task_name]:
+                    elif isinstance(token, IterationTerminationToken):
+                        if token.tag in checklist:
                             if logger.isEnabledFor(logging.DEBUG):
                                 logger.debug(
                                     f"Step {self.name} received iteration termination token {token.tag} "
-                                    f"for port {task_name}"
+                                    f"for port {port_name}"
                                 )
-                            self.iteration_terminaton_checklist[task_name].remove(
-                                token.tag
-                            )
+                            checklist.remove(token.tag)
                     # Otherwise, build combination and set default status to COMPLETED
                     else:
                         if logger.isEnabledFor(logging.DEBUG):
                             logger.debug(
                                 f"Step {self.name} received token {token.tag} "
-                                f"on port {task_name}"
+                                f"on port {port_name}"
                             )
                         status = Status.COMPLETED
-                        if (
-                            ".".join(token.tag.split(".")[:-1])
-                            not in self.iteration_terminaton_checklist[task_name]
-                        ):
-                            self.iteration_terminaton_checklist[task_name].add(
-                                token.tag
-                            )
+                        if get_tag_prefix(token.tag) not in checklist:
+                            checklist.add(token.tag)
 
                         async for schema in cast(
                             AsyncIterable,
-                            self.combinator.combine(task_name, token),
+                            self.combinator.combine(port_name, token),
                         ):
                             ins = [id for t in schema.values() for id in t["input_ids"]]
-                            for port_name, token in schema.items():
-                                self.get_output_port(port_name).put(
+                            for out_port_name, out_token in schema.items():
+                                output_port = output_ports[out_port_name]
+                                output_port.put(
                                     await self._persist_token(
-                                        token=token["token"],
-                                        port=self.get_output_port(port_name),
+                                        token=out_token["token"],
+                                        port=output_port,
                                         input_token_ids=ins,
                                     )
                                 )
-                    # Create a new task in place of the completed one if the port is not terminated
-                    if not (
-                        task_name in terminated
-                        and len(self.iteration_terminaton_checklist[task_name]) == 0
-                    ):
-                        input_tasks.append(
-                            asyncio.create_task(
-                                self.get_input_ports()[task_name].get(
-                                    posixpath.join(self.name, task_name)
-                                ),
-                                name=task_name,
-                            )
-                        )
+                    # Stop consuming the port when it is terminated and no iteration is pending
+                    if port_name in terminated and not checklist:
+                        finished.add(port_name)
+            finally:
+                for reader in readers:
+                    reader.cancel()
         # Terminate step
         await self.terminate(status)
 
 
 class LoopOutputStep(BaseStep, ABC):
+    __slots__ = ("size_map", "termination_map", "token_map")
+
     def __init__(self, name: str, workflow: Workflow):
         super().__init__(name, workflow)
         self.token_map: MutableMapping[str, MutableSequence[Token]] = {}
@@ -1132,13 +1211,13 @@ class LoopOutputStep(BaseStep, ABC):
                 f"{self.name} step must contain a single output port."
             )
         input_port = self.get_input_port()
+        consumer = self._get_consumer(next(iter(self.input_ports)))
+        output_port = self.get_output_port()
         while True:
-            token = await input_port.get(
-                posixpath.join(self.name, next(iter(self.input_ports)))
-            )
-            prefix = ".".join(token.tag.split(".")[:-1])
+            token = await input_port.get(consumer)
+            prefix = get_tag_prefix(token.tag)
             # If a TerminationToken is received, terminate the step
-            if check_termination(token):
+            if isinstance(token, TerminationToken):
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(f"Step {self.name} received termination token")
                 # If no iterations have been performed, just terminate
@@ -1151,37 +1230,47 @@ class LoopOutputStep(BaseStep, ABC):
                         for k in self.token_map
                     }
             # If an IterationTerminationToken is received, process loop output for the current port
-            elif check_iteration_termination(token):
+            elif isinstance(token, IterationTerminationToken):
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(
                         f"Step {self.name} received iteration termination token {token.tag}."
                     )
-                self.size_map[prefix] = int(token.tag.split(".")[-1])
+                self.size_map[prefix] = int(token.tag.rpartition(".")[2])
             # Otherwise, store the new token in the map
             else:
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(f"Step {self.name} received token {token.tag}.")
-                if prefix not in self.token_map:
-                    self.token_map[prefix] = []
-                self.token_map[prefix].append(token)
-            if len(self.token_map.get(prefix, [])) == self.size_map.get(prefix, -1):
-                self.get_output_port().put(
+                self.token_map.setdefault(prefix, []).append(token)
+            if len(self.token_map.get(prefix, ())) == self.size_map.get(prefix, -1):
+                output_port.put(
                     await self._persist_token(
                         token=await self._process_output(prefix),
-                        port=self.get_output_port(),
-                        input_token_ids=_get_token_ids(self.token_map.get(prefix)),
+                        port=output_port,
+                        input_token_ids=_get_token_ids(self.token_map.get(prefix, ())),
                     )
                 )
+                # Release the tokens of completed loops
+                self.token_map.pop(prefix, None)
+                self.size_map.pop(prefix, None)
             # If all iterations are terminated, terminate the step
             if self.termination_map and all(self.termination_map):
                 break
         # Terminate step
         await self.terminate(
-            Status.SKIPPED if self.get_output_port().empty() else Status.COMPLETED
+            Status.SKIPPED if output_port.empty() else Status.COMPLETED
         )
 
 
 class ScheduleStep(BaseStep):
+    __slots__ = (
+        "binding_config",
+        "hardware_requirement",
+        "input_directory",
+        "job_prefix",
+        "output_directory",
+        "tmp_directory",
+    )
+
     def __init__(
         self,
         name: str,
@@ -1239,54 +1328,66 @@ class ScheduleStep(BaseStep):
         )
 
     async def _propagate_job(
-        self, connector: Connector, locations: MutableSequence[Location], job: Job
+        self,
+        connector: Connector,
+        locations: MutableSequence[Location],
+        job: Job,
+        previous: asyncio.Task | None = None,
     ):
-        # Set job directories
-        allocation = self.workflow.context.scheduler.get_allocation(job.name)
-        path_processor = get_path_processor(connector)
-        job.input_directory = _get_directory(
-            path_processor, job.input_directory, allocation.target
-        )
-        job.output_directory = _get_directory(
-            path_processor, job.output_directory, allocation.target
-        )
-        job.tmp_directory = _get_directory(
-            path_processor, job.tmp_directory, allocation.target
-        )
-        # Create directories
-        await remotepath.mkdirs(
-            connector=connector,
-            locations=locations,
-            paths=[job.input_directory, job.output_directory, job.tmp_directory],
-        )
-        # Register paths
-        for location in locations:
-            for directory in [
-                job.input_directory,
-                job.output_directory,
-                job.tmp_directory,
-            ]:
-                self.workflow.context.data_manager.register_path(
-                    location=location,
-                    path=directory,
-                    relpath=directory,
+        try:
+            # Set job directories
+            workdir = self.workflow.context.scheduler.get_allocation(
+                job.name
+            ).target.workdir
+            join = get_path_processor(connector).join
+            job.input_directory = job.input_directory or join(
+                workdir, utils.random_name()
+            )
+            job.output_directory = job.output_directory or join(
+                workdir, utils.random_name()
+            )
+            job.tmp_directory = job.tmp_directory or join(workdir, utils.random_name())
+            # Create directories
+            await remotepath.mkdirs(
+                connector=connector,
+                locations=locations,
+                paths=[job.input_directory, job.output_directory, job.tmp_directory],
+            )
+            # Register paths
+            data_manager = self.workflow.context.data_manager
+            for location in locations:
+                for directory in [
+                    job.input_directory,
+                    job.output_directory,
+                    job.tmp_directory,
+                ]:
+                    data_manager.register_path(
+                        location=location,
+                        path=directory,
+                        relpath=directory,
+                    )
+            # Preserve the order of job tokens, as consumers pair them with their inputs
+            if previous is not None:
+                await previous
+            # Propagate job
+            token_inputs = []
+            for step_port_name, port in self.get_input_ports().items():
+                if (token := job.inputs.get(step_port_name)) is not None:
+                    token_inputs.append(token)
+                else:  # other tokens from connector ports
+                    token_inputs.extend(t for t in port.token_list if t.persistent_id)
+            output_port = self.get_output_port()
+            output_port.put(
+                await self._persist_token(
+                    token=JobToken(value=job),
+                    port=output_port,
+                    input_token_ids=_get_token_ids(token_inputs),
                 )
-        # Propagate job
-        token_inputs = []
-        for step_port_name in self.input_ports.keys():
-            if step_port_name in job.inputs.keys():
-                token_inputs.append(job.inputs[step_port_name])
-            else:  # other tokens from connector ports
-                for t in self.get_input_port(step_port_name).token_list:
-                    if t.persistent_id:
-                        token_inputs.append(t)
-        self.get_output_port().put(
-            await self._persist_token(
-                token=JobToken(value=job),
-                port=self.get_output_port(),
-                input_token_ids=_get_token_ids(token_inputs),
             )
-        )
+        except Exception:
+            # Release the job resources, so that the scheduler does not wait on them
+            await self.workflow.context.scheduler.notify_status(job.name, Status.FAILED)
+            raise
 
     async def _save_additional_params(
         self, context: StreamFlowContext
@@ -1317,118 +1418,137 @@ class ScheduleStep(BaseStep):
     def get_output_port(self, name: str | None = None) -> JobPort:
         return cast(JobPort, super().get_output_port(name))
 
+    @_handle_step_exceptions
     async def run(self):
-        try:
-            # Retrieve connector
-            connector_ports = cast(
-                MutableMapping[str, ConnectorPort],
-                {
-                    name: self.get_input_port(name)
-                    for name in self.input_ports
-                    if name.startswith("__connector__")
-                },
-            )
-            connectors = await asyncio.gather(
-                *(
-                    asyncio.create_task(port.get_connector(self.name))
-                    for port in connector_ports.values()
-                )
+        # Retrieve connector
+        connector_ports = cast(
+            MutableMapping[str, ConnectorPort],
+            {
+                name: self.get_input_port(name)
+                for name in self.input_ports
+                if name.startswith("__connector__")
+            },
+        )
+        connectors = await asyncio.gather(
+            *(
+                asyncio.create_task(port.get_connector(self.name))
+                for port in connector_ports.values()
             )
-            connectors = {c.deployment_name: c for c in connectors}
-            # If there are input ports
-            input_ports = {
-                k: v
-                for k, v in self.get_input_ports().items()
-                if k not in connector_ports
-            }
-            if input_ports:
-                inputs_map = {}
+        )
+        connectors = {c.deployment_name: c for c in connectors}
+        # If there are input ports
+        input_ports = {
+            k: v for k, v in self.get_input_ports().items() if k not in connector_ports
+        }
+        if input_ports:
+            inputs_map = {}
+            jobs = []
+            try:
                 while True:
                     # Retrieve input tokens
-                    inputs = await self._get_inputs(input_ports)
+                    tokens = await self._get_inputs(input_ports)
                     # Check for termination
-                    if check_termination(inputs.values()):
+                    if check_termination(tokens.values()):
                         break
-                    # Group inputs by tag
-                    _group_by_tag(inputs, inputs_map)
-                    # Process tags
-                    for tag in list(inputs_map.keys()):
-                        if len(inputs_map[tag]) == len(input_ports):
-                            inputs = inputs_map.pop(tag)
-                            # Create Job
-                            job = Job(
-                                name=posixpath.join(
-                                    self.job_prefix, tag.split(".")[-1]
-                                ),
-                                workflow_id=self.workflow.persistent_id,
-                                inputs=inputs,
-                                input_directory=self.input_directory,
-                                output_directory=self.output_directory,
-                                tmp_directory=self.tmp_directory,
-                            )
-                            # Schedule
-                            hardware_requirement = (
-                                self.hardware_requirement.eval(inputs)
-                                if self.hardware_requirement
-                                else None
-                            )
-                            await self.workflow.context.scheduler.schedule(
-                                job, self.binding_config, hardware_requirement
-                            )
-                            locations = self.workflow.context.scheduler.get_locations(
-                                job.name
-                            )
-                            await self._propagate_job(
-                                connectors[locations[0].deployment], locations, job
+                    # Group inputs by tag and process the complete ones
+                    for tag, inputs in _group_by_tag(
+                        tokens, inputs_map, len(input_ports)
+                    ):
+                        # Stop scheduling new jobs if a previous one failed to propagate
+                        jobs = _get_pending_tasks(jobs)
+                        # Create Job
+                        job = Job(
+                            name=posixpath.join(
+                                self.job_prefix, tag.rpartition(".")[2]
+                            ),
+                            workflow_id=self.workflow.persistent_id,
+                            inputs=inputs,
+                            input_directory=self.input_directory,
+                            output_directory=self.output_directory,
+                            tmp_directory=self.tmp_directory,
+                        )
+                        # Schedule
+                        hardware_requirement = (
+                            self.hardware_requirement.eval(inputs)
+                            if self.hardware_requirement
+                            else None
+                        )
+                        await self.workflow.context.scheduler.schedule(
+                            job, self.binding_config, hardware_requirement
+                        )
+                        locations = self.workflow.context.scheduler.get_locations(
+                            job.name
+                        )
+                        # Propagate the job without blocking the input loop
+                        jobs.append(
+                            asyncio.create_task(
+                                self._propagate_job(
+                                    connectors[locations[0].deployment],
+                                    locations,
+                                    job,
+                                    jobs[-1] if jobs else None,
+                                )
                             )
-            else:
-                # Create Job
-                job = Job(
-                    name=posixpath.join(self.job_prefix, "0"),
-                    workflow_id=self.workflow.persistent_id,
-                    inputs={},
-                    input_directory=self.input_directory,
-                    output_directory=self.output_directory,
-                    tmp_directory=self.tmp_directory,
-                )
-                # Schedule
-                await self.workflow.context.scheduler.schedule(
-                    job,
-                    self.binding_config,
-                    self.hardware_requirement.eval({})
-                    if self.hardware_requirement
-                    else None,
-                )
-                locations = self.workflow.context.scheduler.get_locations(job.name)
-                await self._propagate_job(
-                    connectors[locations[0].deployment], locations, job
-                )
-            await self.terminate(
-                Status.SKIPPED if self.get_output_port().empty() else Status.COMPLETED
+                        )
+                # Wait for all jobs to be propagated
+                await asyncio.gather(*jobs)
+            finally:
+                # Propagations must not emit jobs after the step terminates
+                for task in jobs:
+                    task.cancel()
+                await asyncio.gather(*jobs, return_exceptions=True)
+        else:
+            # Create Job
+            job = Job(
+                name=posixpath.join(self.job_prefix, "0"),
+                workflow_id=self.workflow.persistent_id,
+                inputs={},
+                input_directory=self.input_directory,
+                output_directory=self.output_directory,
+                tmp_directory=self.tmp_directory,
             )
-        # When receiving a KeyboardInterrupt, propagate it (to allow debugging)
-        except KeyboardInterrupt:
-            raise
-        # When receiving a CancelledError, mark the step as Cancelled
-        except asyncio.CancelledError:
-            await self.terminate(Status.CANCELLED)
-        except Exception as e:
-            logger.exception(e)
-            await self.terminate(Status.FAILED)
+            # Schedule
+            await self.workflow.context.scheduler.schedule(
+                job,
+                self.binding_config,
+                self.hardware_requirement.eval({})
+                if self.hardware_requirement
+                else None,
+            )
+            locations = self.workflow.context.scheduler.get_locations(job.name)
+            await self._propagate_job(
+                connectors[locations[0].deployment], locations, job
+            )
+        await self.terminate(
+            Status.SKIPPED if self.get_output_port().empty() else Status.COMPLETED
+        )
 
 
 class ScatterStep(BaseStep):
-    async def _scatter(self, token: Token):
-        if isinstance(token.value, Token):
-            await self._scatter(token.value)
-        elif isinstance(token, ListToken):
-            output_port = self.get_output_port()
-            for i, t in enumerate(token.value):
-                output_port.put(
+    async def _scatter(
+        self, token: Token, output_port: Port, size_port: Port | None
+    ) -> None:
+        # Unwrap nested tokens iteratively
+        while isinstance(token.value, Token):
+            token = token.value
+        if isinstance(token, ListToken):
+            input_token_ids = _get_token_ids([token])
+            # Notify the expected number of elements to downstream gather steps
+            if size_port is not None:
+                size_port.put(
                     await self._persist_token(
-                        token=t.retag(token.tag + "." + str(i)),
-                        port=output_port,
-                        input_token_ids=_get_token_ids([token]),
+                        token=Token(value=len(token.value), tag=token.tag),
+                        port=size_port,
+                        input_token_ids=input_token_ids,
+                    )
+                )
+            # Bind loop invariants, as this loop runs once per scattered element
+            persist_token, put = self._persist_token, output_port.put
+            tag_prefix = token.tag + "."
+            for i, t in enumerate(token.value):
+                put(
+                    await persist_token(
+                        t.retag(tag_prefix + str(i)), output_port, input_token_ids
                     )
                 )
         else:
@@ -1443,32 +1563,49 @@ class ScatterStep(BaseStep):
             )
 
     def add_output_port(self, name: str, port: Port) -> None:
-        if not self.output_ports or port.name in self.output_ports:
+        if (
+            name == "__size__"
+            or not self.output_ports.keys() - {"__size__"}
+            or port.name in self.output_ports
+        ):
             super().add_output_port(name, port)
         else:
             raise WorkflowDefinitionException(
                 "Scatter step must contain a single output port."
             )
 
+    def add_size_port(self, port: Port) -> None:
+        self.add_output_port("__size__", port)
+
+    def get_output_port(self, name: str | None = None) -> Port:
+        # The size port is never the default output port
+        if name is None and "__size__" in self.output_ports:
+            if len(port_names := self.output_ports.keys() - {"__size__"}) == 1:
+                name = next(iter(port_names))
+        return super().get_output_port(name)
+
+    def get_size_port(self) -> Port | None:
+        return self.get_output_port("__size__")
+
     async def run(self):
         if len(self.input_ports) != 1:
             raise WorkflowDefinitionException(
                 "Scatter step must contain a single input port."
             )
-        if len(self.output_ports) != 1:
+        if len(self.output_ports.keys() - {"__size__"}) != 1:
             raise WorkflowDefinitionException(
                 "Scatter step must contain a single output port."
             )
         input_port = self.get_input_port()
+        consumer = self._get_consumer(next(iter(self.input_ports)))
         output_port = self.get_output_port()
+        size_port = self.get_size_port()
         while True:
-            token = await input_port.get(
-                posixpath.join(self.name, next(iter(self.input_ports)))
-            )
+            token = await input_port.get(consumer)
             if isinstance(token, TerminationToken):
                 break
             else:
-                await self._scatter(token)
+                await self._scatter(token, output_port, size_port)
         # Terminate step
         await self.terminate(
             Status.SKIPPED if output_port.empty() else Status.COMPLETED
@@ -1504,6 +1641,7 @@ class TransferStep(BaseStep, ABC):
             **{"job_port": self.get_input_port("__job__").persistent_id},
         }
 
+    @_handle_step_exceptions
     async def run(self):
         # Set default status as SKIPPED
         status = Status.SKIPPED
@@ -1512,54 +1650,40 @@ class TransferStep(BaseStep, ABC):
             k: v for k, v in self.get_input_ports().items() if k != "__job__"
         }
         if input_ports:
+            job_port = cast(JobPort, self.get_input_port("__job__"))
+            output_ports = self.get_output_ports()
             inputs_map = {}
-            try:
-                while True:
-                    # Retrieve input tokens
-                    inputs = await self._get_inputs(input_ports)
-                    # Retrieve job
-                    job = await cast(JobPort, self.get_input_port("__job__")).get_job(
-                        self.name
+            while True:
+                # Retrieve input tokens
+                tokens = await self._get_inputs(input_ports)
+                # Retrieve job
+                job = await job_port.get_job(self.name)
+                # Check for termination
+                if check_termination(tokens.values()) or job is None:
+                    break
+                # Group inputs by tag and process the complete ones
+                for _, inputs in _group_by_tag(tokens, inputs_map, len(input_ports)):
+                    # Change default status to COMPLETED
+                    status = Status.COMPLETED
+                    input_token_ids = _get_token_ids(
+                        list(inputs.values())
+                        + [get_job_token(job.name, job_port.token_list)]
                     )
-                    # Check for termination
-                    if check_termination(inputs.values()) or job is None:
-                        break
-                    # Group inputs by tag
-                    _group_by_tag(inputs, inputs_map)
-                    # Process tags
-                    for tag in list(inputs_map.keys()):
-                        if len(inputs_map[tag]) == len(input_ports):
-                            inputs = inputs_map.pop(tag)
-                            # Change default status to COMPLETED
-                            status = Status.COMPLETED
-                            # Transfer token
-                            for port_name, token in inputs.items():
-                                self.get_output_port(port_name).put(
-                                    await self._persist_token(
-                                        token=await self.transfer(job, token),
-                                        port=self.get_output_port(port_name),
-                                        input_token_ids=_get_token_ids(
-                                            list(inputs.values())
-                                            + [
-                                                get_job_token(
-                                                    job.name,
-                                                    self.get_input_port(
-                                                        "__job__"
-                                                    ).token_list,
-                                                )
-                                            ]
-                                        ),
-                                    )
-                                )
-            # When receiving a KeyboardInterrupt, propagate it (to allow debugging)
-            except KeyboardInterrupt:
-                raise
-            # When receiving a CancelledError, mark the step as Cancelled
-            except asyncio.CancelledError:
-                await self.terminate(Status.CANCELLED)
-            except Exception as e:
-                logger.exception(e)
-                await self.terminate(Status.FAILED)
+                    # Transfer tokens concurrently, as each of them goes to a different port
+                    for port_name, token in zip(
+                        inputs.keys(),
+                        await asyncio.gather(
+                            *(self.transfer(job, token) for token in inputs.values())
+                        ),
+                    ):
+                        output_port = output_ports[port_name]
+                        output_port.put(
+                            await self._persist_token(
+                                token=token,
+                                port=output_port,
+                                input_token_ids=input_token_ids,
+                            )
+                        )
         # Terminate step
         await self.terminate(status)
 
@@ -1572,72 +1696,59 @@ class Transformer(BaseStep, ABC):
     def __init__(self, name: str, workflow: Workflow):
         super().__init__(name, workflow)
 
+    @_handle_step_exceptions
     async def run(self):
-        try:
-            if self.input_ports:
-                inputs_map = {}
-                while True:
-                    # Retrieve input tokens
-                    inputs = await self._get_inputs(self.get_input_ports())
-                    # Check for termination
-                    if check_termination(inputs.values()):
-                        break
-                    # Group inputs by tag
-                    _group_by_tag(inputs, inputs_map)
-                    # Process tags
-                    for tag in list(inputs_map.keys()):
-                        if len(inputs_map[tag]) == len(self.input_ports):
-                            inputs = inputs_map.pop(tag)
-                            # Check for iteration termination and propagate
-                            if check_iteration_termination(inputs.values()):
-                                for port_name, token in inputs.items():
-                                    self.get_output_port(port_name).put(
-                                        await self._persist_token(
-                                            token=token.update(token.value),
-                                            port=self.get_output_port(port_name),
-                                            input_token_ids=_get_token_ids(
-                                                inputs.values()
-                                            ),
-                                        )
-                                    )
-                            # Otherwise, apply transformation and propagate outputs
-                            else:
-                                for port_name, token in (
-                                    await self.transform(inputs)
-                                ).items():
-                                    self.get_output_port(port_name).put(
-                                        await self._persist_token(
-                                            token=token,
-                                            port=self.get_output_port(port_name),
-                                            input_token_ids=_get_token_ids(
-                                                inputs.values()
-                                            ),
-                                        )
-                                    )
-            else:
-                for port_name, token in (await self.transform({})).items():
-                    self.get_output_port(port_name).put(
-                        await self._persist_token(
-                            token=token,
-                            port=self.get_output_port(port_name),
-                            input_token_ids=[],
-                        )
+        output_ports = self.get_output_ports()
+        if self.input_ports:
+            input_ports = self.get_input_ports()
+            inputs_map = {}
+            while True:
+                # Retrieve input tokens
+                tokens = await self._get_inputs(input_ports)
+                # Check for termination
+                if check_termination(tokens.values()):
+                    break
+                # Group inputs by tag and process the complete ones
+                for _, inputs in _group_by_tag(tokens, inputs_map, len(input_ports)):
+                    input_token_ids = _get_token_ids(inputs.values())
+                    # Check for iteration termination and propagate
+                    if check_iteration_termination(inputs.values()):
+                        for port_name, token in inputs.items():
+                            output_port = output_ports[port_name]
+                            output_port.put(
+                                await self._persist_token(
+                                    token=token.update(token.value),
+                                    port=output_port,
+                                    input_token_ids=input_token_ids,
+                                )
+                            )
+                    # Otherwise, apply transformation and propagate outputs
+                    else:
+                        for port_name, token in (await self.transform(inputs)).items():
+                            output_port = output_ports[port_name]
+                            output_port.put(
+                                await self._persist_token(
+                                    token=token,
+                                    port=output_port,
+                                    input_token_ids=input_token_ids,
+                                )
+                            )
+        else:
+            for port_name, token in (await self.transform({})).items():
+                output_port = output_ports[port_name]
+                output_port.put(
+                    await self._persist_token(
+                        token=token,
+                        port=output_port,
+                        input_token_ids=[],
                     )
-            # Terminate step
-            await self.terminate(
-                Status.SKIPPED
-                if any(p.empty() for p in self.get_output_ports().values())
-                else Status.COMPLETED
-            )
-        # When receiving a KeyboardInterrupt, propagate it (to allow debugging)
-        except KeyboardInterrupt:
-            raise
-        # When receiving a CancelledError, mark the step as Cancelled
-        except asyncio.CancelledError:
-            await self.terminate(Status.CANCELLED)
-        except Exception as e:
-            logger.exception(e)
-            await self.terminate(Status.FAILED)
+                )
+        # Terminate step
+        await self.terminate(
+            Status.SKIPPED
+            if any(p.empty() for p in output_ports.values())
+            else Status.COMPLETED
+        )
 
     @abstractmethod
     async def transform(
@@ -11,6 +11,8 @@ from streamflow.core.workflow import Job, Token
 
 
 class IterationTerminationToken(Token):
+    __slots__ = ()
+
     def __init__(self, tag: str):
         super().__init__(None, tag)
 
@@ -34,12 +36,16 @@ class IterationTerminationToken(Token):
 
 
 class FileToken(Token, ABC):
+    __slots__ = ()
+
     @abstractmethod
     async def get_paths(self, context: StreamFlowContext) -> MutableSequence[str]:
         ...
 
 
 class JobToken(Token):
+    __slots__ = ()
+
     async def _save_value(self, context: StreamFlowContext):
         return {"job": await self.value.save(context)}
 
@@ -58,6 +64,8 @@ class JobToken(Token):
 
 
 class ListToken(Token):
+    __slots__ = ()
+
     @classmethod
     async def _load(
         cls,
@@ -98,6 +106,8 @@ class ListToken(Token):
 
 
 class ObjectToken(Token):
+    __slots__ = ()
+
     @classmethod
     async def _load(
         cls,
@@ -150,6 +160,8 @@ class ObjectToken(Token):
 
 
 class TerminationToken(Token):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(None)
 
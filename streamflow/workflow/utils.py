@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import MutableSequence, TYPE_CHECKING
 
+from cachetools import LRUCache, cached
+
 from streamflow.core.exception import WorkflowExecutionException
 from streamflow.core.workflow import Token
 from streamflow.workflow.token import (
@@ -29,14 +31,22 @@ def check_token_class(inputs: Token | Iterable[Token], cls: type[Token]):
         return isinstance(inputs, cls)
     else:
         for token in inputs:
-            if isinstance(token, MutableSequence):
+            # Test the concrete Token class first, as ABC checks are much slower
+            if isinstance(token, Token):
+                if isinstance(token, cls):
+                    return True
+            elif isinstance(token, MutableSequence):
                 if check_token_class(token, cls):
                     return True
-            elif isinstance(token, cls):
-                return True
         return False
 
 
+@cached(LRUCache(maxsize=4096))
+def get_tag_prefix(tag: str, depth: int = 1) -> str:
+    parts = tag.rsplit(".", depth)
+    return parts[0] if len(parts) > depth else ""
+
+
 def get_token_value(token: Token) -> Any:
     if isinstance(token, ListToken):
         return [get_token_value(t) for t in token.value]
@@ -0,0 +1,234 @@
+import io
+import os
+import shutil
+
+import pytest
+
+from streamflow.core.deployment import LOCAL_LOCATION, Location
+from streamflow.deployment.connector import local
+
+
+def _local_connector(tmp_path) -> local.LocalConnector:
+    return local.LocalConnector(
+        deployment_name=LOCAL_LOCATION, config_dir=str(tmp_path)
+    )
+
+
+def _local_location() -> Location:
+    return Location(deployment=LOCAL_LOCATION, name=LOCAL_LOCATION)
+
+
+def test_copy_file_onto_itself(tmp_path):
+    """Test that copying a file onto itself fails without truncating it."""
+    path = tmp_path / "file"
+    path.write_bytes(b"StreamFlow")
+    with pytest.raises(shutil.SameFileError):
+        local._copy_file(str(path), str(path))
+    assert path.read_bytes() == b"StreamFlow"
+
+
+def test_copy_file_short_kernel_copy(tmp_path, monkeypatch):
+    """Test that short kernel-side copies are completed in user space."""
+
+    def _short_copy(infd: int, outfd: int, count: int, offset: int) -> int:
+        if offset > 0:
+            return 0
+        os.lseek(outfd, offset, os.SEEK_SET)
+        return os.write(outfd, os.pread(infd, count // 2, offset))
+
+    monkeypatch.setattr(local, "_CLONE_FUNCTIONS", ())
+    monkeypatch.setattr(local, "_COPY_FUNCTIONS", (_short_copy,))
+    content = os.urandom(2**20 + 1)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(content)
+    local._copy_file(str(src), str(dst), bufsize=2**12)
+    assert dst.read_bytes() == content
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="Named pipes are not supported")
+def test_copy_file_named_pipe(tmp_path):
+    """Test that copying a named pipe fails instead of blocking."""
+    os.mkfifo(tmp_path / "fifo")
+    with pytest.raises(shutil.SpecialFileError):
+        local._copy_file(str(tmp_path / "fifo"), str(tmp_path / "dst"))
+
+
+@pytest.mark.asyncio
+async def test_copy_directory_timestamps(tmp_path):
+    """Test that copying a directory tree preserves file and directory timestamps."""
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    (src / "inner").mkdir(parents=True)
+    (src / "inner" / "file").write_text("StreamFlow")
+    for path in (src / "inner" / "file", src / "inner", src):
+        os.utime(path, ns=(10**18, 10**18))
+    connector = _local_connector(tmp_path)
+    await connector.copy_remote_to_remote(
+        src=str(src),
+        dst=str(dst),
+        locations=[_local_location()],
+        source_location=_local_location(),
+    )
+    for path in ("inner/file", "inner", "."):
+        assert os.stat(dst / path).st_mtime_ns == 10**18
+
+
+@pytest.mark.asyncio
+async def test_run_capture_output(tmp_path):
+    """Test that commands return their own output and exit status."""
+    connector = _local_connector(tmp_path)
+    assert await connector.run(
+        _local_location(), ["echo", "StreamFlow"], capture_output=True
+    ) == ("StreamFlow", 0)
+    assert await connector.run(
+        _local_location(), ["exit", "3"], capture_output=True
+    ) == ("", 3)
+    assert await connector.run(
+        _local_location(), ["pwd"], workdir=str(tmp_path), capture_output=True
+    ) == (str(tmp_path), 0)
+
+
+@pytest.mark.asyncio
+async def test_run_environment(tmp_path, monkeypatch):
+    """Test that commands inherit the current environment of the process."""
+    connector = _local_connector(tmp_path)
+    await connector.run(_local_location(), ["true"])
+    monkeypatch.setenv("STREAMFLOW_TEST_VAR", "StreamFlow")
+    assert await connector.run(
+        _local_location(), ["echo", "$STREAMFLOW_TEST_VAR"], capture_output=True
+    ) == ("StreamFlow", 0)
+
+
+@pytest.mark.asyncio
+async def test_run_background_output(tmp_path):
+    """Test that the output of background processes does not leak into later commands."""
+    connector = _local_connector(tmp_path)
+    assert await connector.run(
+        _local_location(),
+        ["sh", "-c", "'(sleep 1; echo LATE) &'"],
+        capture_output=True,
+    ) == ("LATE", 0)
+    assert await connector.run(
+        _local_location(), ["echo", "X"], capture_output=True
+    ) == ("X", 0)
+
+
+@pytest.mark.asyncio
+async def test_copy_large_directory(tmp_path):
+    """Test copying a directory tree large enough to be split among worker processes."""
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    num_files = local._PROCESS_COPY_THRESHOLD + 100
+    for i in range(num_files):
+        path = src / str(i % 10) / str(i)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(str(i))
+    connector = _local_connector(tmp_path)
+    try:
+        await connector.copy_remote_to_remote(
+            src=str(src),
+            dst=str(dst),
+            locations=[_local_location()],
+            source_location=_local_location(),
+        )
+        assert connector._process_executor is not None
+    finally:
+        await connector.undeploy(False)
+    assert connector._process_executor is None
+    for i in range(num_files):
+        assert (dst / str(i % 10) / str(i)).read_text() == str(i)
+
+
+@pytest.mark.parametrize(
+    "files,cores",
+    [
+        ({"/sys/fs/cgroup/cpu.max": "50000 100000"}, 1.0),
+        ({"/sys/fs/cgroup/cpu.max": "250000 100000"}, 2.5),
+        ({"/sys/fs/cgroup/cpu.max": "max 100000"}, 8.0),
+        (
+            {
+                "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "20000",
+                "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000",
+            },
+            1.0,
+        ),
+        (
+            {
+                "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "300000",
+                "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000",
+            },
+            3.0,
+        ),
+        (
+            {
+                "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1",
+                "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000",
+            },
+            8.0,
+        ),
+        ({}, 8.0),
+    ],
+)
+def test_get_cores_cgroup_quota(monkeypatch, files, cores):
+    """Test that cgroup CPU quotas bound the local cores, without going below one."""
+
+    def _open(path, *args, **kwargs):
+        if path in files:
+            return io.StringIO(files[path])
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(local, "open", _open, raising=False)
+    monkeypatch.setattr(local.sys, "platform", "linux")
+    monkeypatch.setattr(
+        local.os, "sched_getaffinity", lambda pid: set(range(8)), raising=False
+    )
+    local._get_cores.cache_clear()
+    try:
+        assert local._get_cores() == cores
+    finally:
+        local._get_cores.cache_clear()
+
+
+def test_copy_file_onto_hardlink(tmp_path):
+    """Test that writable copies onto hardlinked destinations leave the other links intact."""
+    src, dst, other = tmp_path / "src", tmp_path / "dst", tmp_path / "other"
+    src.write_text("StreamFlow")
+    other.write_text("Other")
+    local._copy_file(str(src), str(dst), hardlink=True)
+    assert os.path.samefile(src, dst)
+    local._copy_file(str(src), str(dst))
+    assert not os.path.samefile(src, dst)
+    local._copy_file(str(src), str(dst), hardlink=True)
+    local._copy_file(str(other), str(dst))
+    assert src.read_text() == "StreamFlow"
+    assert dst.read_text() == "Other"
+
+
+@pytest.mark.asyncio
+async def test_copy_read_only_hardlink_opt_in(tmp_path):
+    """Test that read-only copies are hardlinked only when explicitly enabled."""
+    src = tmp_path / "src"
+    src.write_text("StreamFlow")
+    for hardlink in (False, True):
+        connector = local.LocalConnector(
+            deployment_name=LOCAL_LOCATION,
+            config_dir=str(tmp_path),
+            hardlinkReadOnly=hardlink,
+        )
+        dst = tmp_path / f"dst_{hardlink}"
+        await connector.copy_remote_to_remote(
+            src=str(src),
+            dst=str(dst),
+            locations=[_local_location()],
+            source_location=_local_location(),
+            read_only=True,
+        )
+        assert os.path.samefile(src, dst) == hardlink
+
+
+@pytest.mark.asyncio
+async def test_get_available_locations_mutable(tmp_path):
+    """Test that callers can modify the available locations without affecting the cache."""
+    connector = _local_connector(tmp_path)
+    locations = await connector.get_available_locations()
+    location = locations.pop(LOCAL_LOCATION)
+    locations = await connector.get_available_locations()
+    assert locations[LOCAL_LOCATION] is location
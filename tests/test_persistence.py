@@ -183,6 +183,24 @@ async def test_gather_step(context: StreamFlowContext):
     await save_load_and_test(step, context)
 
 
+@pytest.mark.asyncio
+async def test_gather_step_size_port(context: StreamFlowContext):
+    """Test saving and loading GatherStep with a size port from database"""
+    workflow = Workflow(
+        context=context, type="cwl", name=utils.random_name(), config={}
+    )
+    port = workflow.create_port()
+    await workflow.save(context)
+
+    step = workflow.create_step(
+        cls=GatherStep,
+        name=utils.random_name() + "-gather",
+        depth=1,
+        size_port=port,
+    )
+    await save_load_and_test(step, context)
+
+
 @pytest.mark.asyncio
 async def test_scatter_step(context: StreamFlowContext):
     """Test saving and loading ScatterStep from database"""
@@ -10,6 +10,7 @@ from streamflow.core import utils
 from streamflow.core.config import BindingConfig
 from streamflow.core.context import StreamFlowContext
 from streamflow.core.deployment import Target
+from streamflow.core.exception import WorkflowExecutionException
 from streamflow.core.persistence import DatabaseLoadingContext
 from streamflow.core.workflow import Port, Status, Step, Token, Workflow
 from streamflow.cwl.command import CWLCommand, CWLCommandToken
@@ -234,6 +235,101 @@ async def test_scatter_step(context: StreamFlowContext):
         )
 
 
+@pytest.mark.asyncio
+async def test_scatter_gather_size_port(context: StreamFlowContext):
+    """Test token provenance for a GatherStep driven by the ScatterStep size port"""
+    workflow, (in_port, scatter_port, size_port, out_port) = await create_workflow(
+        context, num_port=4
+    )
+    port_name = "test"
+    scatter_step = workflow.create_step(
+        cls=ScatterStep, name=utils.random_name() + "-scatter"
+    )
+    scatter_step.add_input_port(port_name, in_port)
+    scatter_step.add_output_port(port_name, scatter_port)
+    scatter_step.add_size_port(size_port)
+    gather_step = workflow.create_step(
+        cls=GatherStep, name=utils.random_name() + "-gather", size_port=size_port
+    )
+    gather_step.add_input_port(port_name, scatter_port)
+    gather_step.add_output_port(port_name, out_port)
+    # Size ports are never returned as the default ports
+    assert scatter_step.get_output_port() == scatter_port
+    assert gather_step.get_input_port() == scatter_port
+
+    token_list = [ListToken([Token("a"), Token("b"), Token("c")])]
+    await put_tokens(token_list, in_port, context)
+    await workflow.save(context)
+    executor = StreamFlowExecutor(workflow)
+    await executor.run()
+
+    assert len(size_port.token_list) == 2
+    assert size_port.token_list[0].value == 3
+    # Each scattered list persists an extra size token in the provenance graph
+    await verify_dependency_tokens(
+        token=in_port.token_list[0],
+        port=in_port,
+        context=context,
+        expected_depender=scatter_port.token_list[:-1] + size_port.token_list[:-1],
+    )
+    await verify_dependency_tokens(
+        token=size_port.token_list[0],
+        port=size_port,
+        context=context,
+        expected_dependee=[in_port.token_list[0]],
+    )
+    assert len(out_port.token_list) == 2
+    assert [t.value for t in out_port.token_list[0].value] == ["a", "b", "c"]
+    await verify_dependency_tokens(
+        token=out_port.token_list[0],
+        port=out_port,
+        context=context,
+        expected_dependee=scatter_port.token_list[:-1],
+    )
+
+
+@pytest.mark.asyncio
+async def test_gather_step_size_port_streaming(context: StreamFlowContext):
+    """Test that GatherStep emits a group as soon as its size is reached, before termination"""
+    workflow, (in_port, size_port, out_port) = await create_workflow(
+        context, num_port=3
+    )
+    port_name = "test"
+    gather_step = workflow.create_step(
+        cls=GatherStep, name=utils.random_name() + "-gather", size_port=size_port
+    )
+    gather_step.add_input_port(port_name, in_port)
+    gather_step.add_output_port(port_name, out_port)
+    await workflow.save(context)
+
+    size_token = Token(value=2, tag="0")
+    await size_token.save(context, size_port.persistent_id)
+    size_port.put(size_token)
+    token_list = [Token("b", tag="0.1"), Token("a", tag="0.0")]
+    for t in token_list:
+        await t.save(context, in_port.persistent_id)
+        in_port.put(t)
+    # Input ports are left open, so the step cannot rely on termination
+    task = asyncio.create_task(gather_step.run())
+    try:
+        token = await asyncio.wait_for(out_port.get(utils.random_name()), timeout=10)
+        assert not task.done()
+        assert isinstance(token, ListToken)
+        assert [t.value for t in token.value] == ["a", "b"]
+        await verify_dependency_tokens(
+            token=token,
+            port=out_port,
+            context=context,
+            expected_dependee=token_list,
+        )
+    finally:
+        in_port.put(TerminationToken())
+        size_port.put(TerminationToken())
+        await task
+    assert len(out_port.token_list) == 2
+    assert isinstance(out_port.token_list[-1], TerminationToken)
+
+
 @pytest.mark.asyncio
 async def test_deploy_step(context: StreamFlowContext):
     """Test token provenance for DeployStep"""
@@ -413,6 +509,36 @@ async def test_combinator_step_dot_product(context: StreamFlowContext):
     )
 
 
+@pytest.mark.asyncio
+async def test_combinator_step_reader_failure(context: StreamFlowContext, monkeypatch):
+    """Test that CombinatorStep raises the failure of an input port reader instead of hanging"""
+    workflow, (in_port, out_port, in_port_2, out_port_2) = await create_workflow(
+        context, num_port=4
+    )
+    step = workflow.create_step(
+        cls=CombinatorStep,
+        name=utils.random_name() + "-combinator",
+        combinator=DotProductCombinator(name=utils.random_name(), workflow=workflow),
+    )
+    port_name = "test"
+    step.add_input_port(port_name, in_port)
+    step.add_output_port(port_name, out_port)
+    port_name_2 = f"{port_name}_2"
+    step.add_input_port(port_name_2, in_port_2)
+    step.add_output_port(port_name_2, out_port_2)
+    step.combinator.add_item(port_name)
+    step.combinator.add_item(port_name_2)
+    await workflow.save(context)
+
+    async def _get(consumer: str) -> Token:
+        raise WorkflowExecutionException("Port failure")
+
+    monkeypatch.setattr(in_port_2, "get", _get)
+    await put_tokens([Token("a")], in_port, context)
+    with pytest.raises(WorkflowExecutionException, match="Port failure"):
+        await asyncio.wait_for(step.run(), timeout=10)
+
+
 @pytest.mark.asyncio
 async def test_combinator_step_cartesian_product(context: StreamFlowContext):
     """Test token provenance for CartesianProductCombinator"""
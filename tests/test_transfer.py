@@ -219,3 +219,56 @@ async def test_multiple_files(
             for _ in range(20)
         )
     )
+
+
+@pytest.mark.asyncio
+async def test_files_to_same_folder(
+    context, src_connector, src_location, dst_connector, dst_location, monkeypatch
+):
+    """Test that only the first transfer into a new folder creates it."""
+    if isinstance(src_connector, LocalConnector):
+        src_path = os.path.join(tempfile.gettempdir(), utils.random_name())
+    else:
+        src_path = posixpath.join("/tmp", utils.random_name())
+    if isinstance(dst_connector, LocalConnector):
+        dst_path = os.path.join(tempfile.gettempdir(), utils.random_name())
+    else:
+        dst_path = posixpath.join("/tmp", utils.random_name())
+    src_processor = get_path_processor(src_connector)
+    dst_processor = get_path_processor(dst_connector)
+    mkdir_paths = []
+    mkdir = remotepath.mkdir
+
+    async def _mkdir(connector, locations, path):
+        mkdir_paths.append(path)
+        await mkdir(connector, locations, path)
+
+    monkeypatch.setattr(remotepath, "mkdir", _mkdir)
+    try:
+        await remotepath.mkdir(src_connector, [src_location], src_path)
+        src_path = await remotepath.follow_symlink(
+            context, src_connector, src_location, src_path
+        )
+        for name in ("first", "second"):
+            src_file = src_processor.join(src_path, name)
+            await remotepath.write(src_connector, src_location, src_file, name)
+            context.data_manager.register_path(
+                location=src_location,
+                path=src_file,
+                relpath=src_file,
+                data_type=DataType.PRIMARY,
+            )
+            await context.data_manager.transfer_data(
+                src_location=src_location,
+                src_path=src_file,
+                dst_locations=[dst_location],
+                dst_path=dst_processor.join(dst_path, name),
+                writable=False,
+            )
+            assert await remotepath.exists(
+                dst_connector, dst_location, dst_processor.join(dst_path, name)
+            )
+        assert mkdir_paths.count(dst_path) == 1
+    finally:
+        await remotepath.rm(src_connector, src_location, src_path)
+        await remotepath.rm(dst_connector, dst_location, dst_path)